@@ -1,31 +1,82 @@
 from flask import Flask
 from flask_cors import CORS
-from .extensions import db, migrate, jwt
-from .config import Config
+from .extensions import db, jwt
+from .config import Config, engine_options
+from .utils.cache import TTLCache
+from .utils.response_cache import init_response_cache
+from .utils.json_provider import FastJSONProvider
+from .utils.metrics import init_metrics
+from .utils.pool import pool_stats
+from .utils.replica import init_replica
+from .utils.tokens import init_tokens
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'], app.config['DB_POOL_PROFILE']
+    ))
+    
+    # Optional read replica; its bind has to be configured before db.init_app
+    init_replica(app)
     
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
     jwt.init_app(app)
+    init_tokens(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     
+    # Optional process-wide cache of membership roles
+    app.extensions['membership_cache'] = None
+    if app.config['MEMBERSHIP_CACHE_TTL'] > 0:
+        app.extensions['membership_cache'] = TTLCache(
+            maxsize=app.config['MEMBERSHIP_CACHE_SIZE'],
+            ttl=app.config['MEMBERSHIP_CACHE_TTL']
+        )
+    
+    # Optional ETag-validated cache for group reads
+    init_response_cache(app)
+    
+    # Per-route latency and SQL usage, served on /api/metrics
+    init_metrics(app)
+    
     # Register blueprints
-    from .routes import auth_bp, users_bp, groups_bp, transactions_bp
+    from .routes import auth_bp, users_bp, groups_bp, transactions_bp, ops_bp
+    from .routes.ops import require_ops_token
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(groups_bp, url_prefix='/api/groups')
     app.register_blueprint(transactions_bp, url_prefix='/api')
+    app.register_blueprint(ops_bp, url_prefix='/api/ops')
     
-    # Create database tables if they don't exist
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands
+    # The schema is managed by migrations (`flask db upgrade`), not on boot
+    from .commands import migrate_cli, summaries_cli, ledger_cli, analytics_cli, outbox_cli, idempotency_cli
+    app.cli.add_command(migrate_cli)
+    app.cli.add_command(summaries_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(idempotency_cli)
     
     @app.route('/api/health')
     def health_check():
         return {"status": "healthy"}
     
+    @app.route('/api/metrics')
+    def metrics():
+        # Pool usage is operational detail, behind the same token as /api/ops
+        denied = require_ops_token()
+        if denied is not None:
+            return denied
+        
+        stats = pool_stats(db.engine)
+        gauges = {
+            f'db_pool_{name}': (f'Connection pool {name.replace("_", " ")}', stats[name])
+            for name in ('checked_out', 'checked_in', 'overflow') if name in stats
+        }
+        body = app.extensions['metrics'].render(gauges)
+        return app.response_class(body, mimetype='text/plain; version=0.0.4')
+    
     return app
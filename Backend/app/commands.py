@@ -0,0 +1,143 @@
+import threading
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup, ScriptInfo
+from app.extensions import db
+
+class MigrateGroup(click.Group):
+    """
+    Flask-Migrate's `flask db` group, loaded only when it is run: it imports
+    alembic, which the server processes never need
+    """
+    
+    def make_context(self, info_name, args, parent=None, **extra):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as commands
+        
+        app = parent.ensure_object(ScriptInfo).load_app()
+        if 'migrate' not in app.extensions:
+            Migrate(app, db)
+        return commands.make_context(info_name, args, parent=parent, **extra)
+
+migrate_cli = MigrateGroup('db', help='Perform database migrations.')
+
+summaries_cli = AppGroup('summaries', help='Maintain per-member balance summaries.')
+
+@summaries_cli.command('rebuild')
+def rebuild_summaries_command():
+    """
+    Recompute all member summaries from the transaction ledger
+    """
+    from app.services.summary_service import rebuild_summaries
+    
+    count = rebuild_summaries()
+    click.echo(f'Rebuilt {count} member summaries')
+
+ledger_cli = AppGroup('ledger', help='Audit and checkpoint the group balance ledger.')
+
+@ledger_cli.command('snapshot')
+@click.option('--min-entries', default=1000, show_default=True,
+              help='Only snapshot groups with at least this many entries since their last snapshot.')
+def snapshot_ledger_command(min_entries):
+    """
+    Record balance snapshots for groups with enough new ledger entries
+    """
+    from app.services.ledger_service import take_snapshots
+    
+    count = take_snapshots(min_entries)
+    click.echo(f'Wrote {count} balance snapshots')
+
+@ledger_cli.command('verify')
+@click.option('--full', is_flag=True, help='Re-add the whole ledger instead of starting from snapshots.')
+def verify_ledger_command(full):
+    """
+    Check every group's balance against its ledger
+    """
+    from app.services.ledger_service import verify_ledger
+    
+    mismatches = verify_ledger(full)
+    for group_id, current_amount, expected in mismatches:
+        click.echo(f'Group {group_id}: balance {current_amount}, ledger {expected}')
+    
+    if mismatches:
+        raise click.ClickException(f'{len(mismatches)} groups do not match their ledger')
+    click.echo('All group balances match the ledger')
+
+analytics_cli = AppGroup('analytics', help='Maintain the contribution analytics rollups.')
+
+@analytics_cli.command('rollup')
+def rollup_analytics_command():
+    """
+    Roll up every group's closed days of ledger entries
+    """
+    from app.services.analytics_service import roll_up
+    
+    count = roll_up()
+    click.echo(f'Rolled up {count} groups')
+
+outbox_cli = AppGroup('outbox', help='Carry out the side effects of money movements.')
+
+@outbox_cli.command('work')
+@click.option('--threads', default=1, show_default=True, help='Worker threads draining the outbox concurrently.')
+@click.option('--batch-size', type=int, help='Events claimed per transaction (default OUTBOX_BATCH_SIZE).')
+@click.option('--poll', default=1.0, show_default=True, help='Seconds to wait when no events are due.')
+@click.option('--once', is_flag=True, help='Exit once no events are due instead of polling.')
+def work_outbox_command(threads, batch_size, poll, once):
+    """
+    Process outbox events until interrupted
+    """
+    from app.services.outbox_service import work
+    
+    app = current_app._get_current_object()
+    batch_size = batch_size or app.config['OUTBOX_BATCH_SIZE']
+    
+    # Workers claim events with SKIP LOCKED; without it they would race for the same rows
+    if threads > 1 and db.engine.dialect.name != 'postgresql':
+        click.echo(f'{db.engine.dialect.name} has no SKIP LOCKED; running a single worker thread')
+        threads = 1
+    stop = threading.Event()
+    handled = []
+    
+    def run():
+        with app.app_context():
+            handled.append(work(batch_size, poll, once, stop))
+    
+    workers = [threading.Thread(target=run, name=f'outbox-{n}') for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    try:
+        # Join with a timeout so Ctrl-C still reaches this thread
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(0.5)
+    except KeyboardInterrupt:
+        click.echo('Stopping after the current batch')
+        stop.set()
+        for worker in workers:
+            worker.join()
+    
+    click.echo(f'Handled {sum(handled)} outbox events')
+
+@outbox_cli.command('prune')
+@click.option('--days', default=7, show_default=True, help='Keep events processed in the last this many days.')
+def prune_outbox_command(days):
+    """
+    Delete outbox events processed more than --days ago
+    """
+    from app.services.outbox_service import prune_events
+    
+    count = prune_events(datetime.utcnow() - timedelta(days=days))
+    click.echo(f'Deleted {count} processed outbox events')
+
+idempotency_cli = AppGroup('idempotency', help='Maintain stored Idempotency-Key responses.')
+
+@idempotency_cli.command('prune')
+def prune_idempotency_command():
+    """
+    Delete Idempotency-Keys older than IDEMPOTENCY_KEY_TTL
+    """
+    from app.utils.idempotency import prune_idempotency_keys
+    
+    count = prune_idempotency_keys()
+    click.echo(f'Deleted {count} expired idempotency keys')
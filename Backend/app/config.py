@@ -1,5 +1,39 @@
 import os
 from datetime import timedelta
+from app.utils.pool import InstrumentedQueuePool
+
+# Connection pool presets per deployment profile (DB_POOL_PROFILE, falling
+# back to FLASK_ENV); the individual DB_POOL_* variables override them
+POOL_PROFILES = {
+    'development': {'pool_size': 5, 'max_overflow': 5, 'pool_timeout': 10, 'pool_recycle': 1800},
+    'production': {'pool_size': 10, 'max_overflow': 10, 'pool_timeout': 5, 'pool_recycle': 1800},
+    'loadtest': {'pool_size': 20, 'max_overflow': 20, 'pool_timeout': 2, 'pool_recycle': 600},
+}
+
+def engine_options(uri, profile):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for a database URI and pool profile
+    """
+    options = {'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1'}
+
+    # SQLite keeps its own per-thread or static pool
+    if uri.startswith('sqlite'):
+        return options
+
+    settings = dict(POOL_PROFILES.get(profile, POOL_PROFILES['development']))
+    for key in settings:
+        value = os.environ.get(f'DB_{key.upper()}')
+        if value is not None:
+            settings[key] = int(value)
+
+    options.update(settings, poolclass=InstrumentedQueuePool)
+
+    # Cancel runaway queries server-side instead of letting them pin a connection
+    statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if uri.startswith('postgresql') and statement_timeout > 0:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+
+    return options
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
@@ -7,3 +41,60 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', 30)))
+    
+    # Seconds for which the group roles embedded in an access token are
+    # trusted instead of looking them up; 0 leaves roles out of tokens
+    JWT_ROLE_CLAIMS_TTL = int(os.environ.get('JWT_ROLE_CLAIMS_TTL', 0))
+    
+    # Store of revoked tokens and recent role changes. Like every *_BACKEND
+    # setting: 'local' (single process only) or the import path of a
+    # CacheBackend class shared between workers (see utils/cache.py)
+    TOKEN_STORE_BACKEND = os.environ.get('TOKEN_STORE_BACKEND', 'local')
+    TOKEN_STORE_SIZE = int(os.environ.get('TOKEN_STORE_SIZE', 100000))
+    
+    # Read replica for the read-only GET endpoints; empty reads from the primary.
+    # A user's reads stay on the primary for REPLICA_STICKY_SECONDS after they
+    # changed something, tracked in the REPLICA_STICKY_BACKEND store
+    DATABASE_REPLICA_URI = os.environ.get('DATABASE_REPLICA_URI', '')
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    REPLICA_STICKY_BACKEND = os.environ.get('REPLICA_STICKY_BACKEND', 'local')
+    REPLICA_STICKY_SIZE = int(os.environ.get('REPLICA_STICKY_SIZE', 100000))
+    
+    # Engine options are built from this in create_app unless SQLALCHEMY_ENGINE_OPTIONS is set
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE', os.environ.get('FLASK_ENV', 'development'))
+    
+    # Password hashing: a werkzeug method string (hashes made with other
+    # parameters are upgraded on login), and the number of processes to hash
+    # in, off the request threads; 0 hashes inline
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_QUEUE_PER_WORKER = int(os.environ.get('PASSWORD_HASH_QUEUE_PER_WORKER', 4))
+    
+    # Statements slower than this are logged with their SQL; 0 disables
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 500))
+    
+    # Outbox worker: events claimed per transaction, and failed attempts
+    # before an event is set aside as failed
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 10))
+    
+    # How long an Idempotency-Key on a transaction POST is honored, and how long
+    # a request that hasn't committed yet may hold a key before a retry may take
+    # it over (longer than any request runs, e.g. above DB_STATEMENT_TIMEOUT_MS)
+    IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', 24)))
+    IDEMPOTENCY_LEASE = timedelta(seconds=int(os.environ.get('IDEMPOTENCY_LEASE_SECONDS', 60)))
+    
+    # Shared secret for the /api/ops endpoints and /api/metrics (X-Ops-Token header
+    # or bearer token); empty disables them
+    OPS_TOKEN = os.environ.get('OPS_TOKEN', '')
+    
+    # Process-wide membership cache; 0 disables it (roles are still memoized per request)
+    MEMBERSHIP_CACHE_TTL = int(os.environ.get('MEMBERSHIP_CACHE_TTL', 0))
+    MEMBERSHIP_CACHE_SIZE = int(os.environ.get('MEMBERSHIP_CACHE_SIZE', 10000))
+    
+    # Response cache for group reads, in the RESPONSE_CACHE_BACKEND store;
+    # empty disables it
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', '')
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
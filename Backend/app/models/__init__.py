@@ -2,3 +2,8 @@ from .user import User
 from .group import Group
 from .transaction import Transaction
 from .membership import Membership
+from .member_summary import MemberSummary
+from .ledger import LedgerEntry, BalanceSnapshot
+from .analytics import ContributionRollup, RollupWatermark
+from .outbox import OutboxEvent, AuditEntry
+from .idempotency import IdempotencyKey
@@ -0,0 +1,32 @@
+from app.extensions import db
+
+class ContributionRollup(db.Model):
+    """
+    Settled deposits and withdrawals per group, UTC day, member and type
+
+    Only closed days are rolled up; they are built from the append-only
+    ledger, so a rolled-up day never changes (see services/analytics_service.py)
+    """
+    __tablename__ = 'contribution_rollups'
+    
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(20), primary_key=True)
+    total = db.Column(db.Numeric(14, 2), nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+    
+    # Relationships
+    group = db.relationship('Group', back_populates='contribution_rollups')
+
+class RollupWatermark(db.Model):
+    """
+    The first day of a group's ledger that has not been rolled up yet
+    """
+    __tablename__ = 'rollup_watermarks'
+    
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True)
+    rolled_up_until = db.Column(db.Date, nullable=False)
+    
+    # Relationships
+    group = db.relationship('Group', back_populates='rollup_watermark')
@@ -7,24 +7,32 @@ class Group(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), nullable=False)
     description = db.Column(db.Text)
-    target_amount = db.Column(db.Float, default=0.0)
-    current_amount = db.Column(db.Float, default=0.0)
+    target_amount = db.Column(db.Numeric(14, 2), default=0)
+    current_amount = db.Column(db.Numeric(14, 2), default=0)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Relationships
+    # Relationships; the database's ON DELETE CASCADE removes children a
+    # deleted group hasn't loaded, instead of the ORM loading each collection
     creator = db.relationship('User', back_populates='created_groups')
-    memberships = db.relationship('Membership', back_populates='group', cascade='all, delete-orphan')
-    transactions = db.relationship('Transaction', back_populates='group', cascade='all, delete-orphan')
+    memberships = db.relationship('Membership', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    transactions = db.relationship('Transaction', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    member_summaries = db.relationship('MemberSummary', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    ledger_entries = db.relationship('LedgerEntry', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    balance_snapshots = db.relationship('BalanceSnapshot', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    contribution_rollups = db.relationship('ContributionRollup', back_populates='group', cascade='all, delete-orphan', passive_deletes=True)
+    rollup_watermark = db.relationship('RollupWatermark', back_populates='group', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
     
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'target_amount': self.target_amount,
-            'current_amount': self.current_amount,
+            # Amounts are exact Decimals; cents-precision values survive
+            # the conversion to a JSON number unchanged
+            'target_amount': float(self.target_amount),
+            'current_amount': float(self.current_amount),
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat(),
-            'progress': round((self.current_amount / self.target_amount * 100), 2) if self.target_amount > 0 else 0
+            'progress': float(round(self.current_amount / self.target_amount * 100, 2)) if self.target_amount > 0 else 0
         }
@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.extensions import db
+
+class IdempotencyKey(db.Model):
+    """
+    A client-chosen key for a POST, with the response it got
+
+    status_code is NULL while the first request with the key is still
+    running; afterwards retries are answered with the stored response as
+    long as they send the same request (same fingerprint). applied_at is set
+    by the first commit the request makes, in that same transaction
+    """
+    __tablename__ = 'idempotency_keys'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    body = db.Column(db.Text)
+    applied_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Pruning expired keys
+        db.Index('ix_idempotency_keys_created_at', created_at),
+    )
@@ -0,0 +1,49 @@
+from datetime import datetime
+from app.extensions import db
+
+class LedgerEntry(db.Model):
+    """
+    One change to a group's balance: positive for approved deposits,
+    negative for paid-out withdrawals
+
+    Entries are append-only; Group.current_amount is a cache of their sum
+    that the ledger verifier audits (see services/ledger_service.py)
+    """
+    __tablename__ = 'ledger_entries'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
+    transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id', ondelete='SET NULL'))
+    amount = db.Column(db.Numeric(14, 2), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Relationships
+    group = db.relationship('Group', back_populates='ledger_entries')
+    
+    __table_args__ = (
+        # Tail sums after a snapshot: entries of a group past a given id
+        db.Index('ix_ledger_entries_group_id_id', group_id, id),
+    )
+
+class BalanceSnapshot(db.Model):
+    """
+    A group's balance after every ledger entry up to last_entry_id
+
+    as_of is the time of that last entry, so the balance at any time is the
+    nearest earlier snapshot plus the entries after it
+    """
+    __tablename__ = 'balance_snapshots'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
+    last_entry_id = db.Column(db.Integer, nullable=False)
+    balance = db.Column(db.Numeric(14, 2), nullable=False)
+    as_of = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    group = db.relationship('Group', back_populates='balance_snapshots')
+    
+    __table_args__ = (
+        db.Index('ix_balance_snapshots_group_id_as_of', group_id, as_of),
+    )
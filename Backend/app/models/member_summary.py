@@ -0,0 +1,33 @@
+from datetime import datetime
+from app.extensions import db
+
+class MemberSummary(db.Model):
+    """
+    Running per-member totals for a group, maintained incrementally by the
+    transaction service (see services/summary_service.py)
+    """
+    __tablename__ = 'member_summaries'
+    
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total_deposited = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    total_withdrawn = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    pending_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    pending_count = db.Column(db.Integer, nullable=False, default=0)
+    last_activity_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = db.relationship('User')
+    group = db.relationship('Group', back_populates='member_summaries')
+    
+    def to_dict(self):
+        return {
+            'group_id': self.group_id,
+            'user_id': self.user_id,
+            'username': self.user.username if self.user else None,
+            'total_deposited': float(self.total_deposited),
+            'total_withdrawn': float(self.total_withdrawn),
+            'pending_amount': float(self.pending_amount),
+            'pending_count': self.pending_count,
+            'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None
+        }
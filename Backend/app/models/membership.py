@@ -6,7 +6,7 @@ class Membership(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    group_id = db.Column(db.Integer, db.ForeignKey('groups.id'), nullable=False)
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -14,8 +14,13 @@ class Membership(db.Model):
     user = db.relationship('User', back_populates='memberships')
     group = db.relationship('Group', back_populates='memberships')
     
-    # Constraint to ensure a user can only be a member of a group once
-    __table_args__ = (db.UniqueConstraint('user_id', 'group_id'),)
+    __table_args__ = (
+        # Constraint to ensure a user can only be a member of a group once
+        # (also serves lookups by user_id and by (user_id, group_id))
+        db.UniqueConstraint('user_id', 'group_id'),
+        # Member and admin counts per group
+        db.Index('ix_memberships_group_id_is_admin', 'group_id', 'is_admin'),
+    )
     
     def to_dict(self):
         return {
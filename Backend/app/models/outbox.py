@@ -0,0 +1,53 @@
+from datetime import datetime
+from app.extensions import db
+
+class OutboxEvent(db.Model):
+    """
+    A side effect of a money movement, recorded in the same commit as the
+    movement itself and carried out later by the outbox worker
+
+    An event is due while it is neither processed nor failed and its
+    available_at has passed; failed attempts push available_at back
+    """
+    __tablename__ = 'outbox_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    processed_at = db.Column(db.DateTime)
+    failed_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        # Only the events still waiting for the worker
+        db.Index(
+            'ix_outbox_events_due', available_at, id,
+            postgresql_where=db.text('processed_at IS NULL AND failed_at IS NULL'),
+            sqlite_where=db.text('processed_at IS NULL AND failed_at IS NULL')
+        ),
+    )
+
+class AuditEntry(db.Model):
+    """
+    A record of who did what to a group's money, written by the outbox worker
+
+    event_id is the outbox event the entry came from, so replaying an event
+    can't write it twice
+    """
+    __tablename__ = 'audit_entries'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, nullable=False, unique=True)
+    action = db.Column(db.String(50), nullable=False)
+    actor_id = db.Column(db.Integer)
+    group_id = db.Column(db.Integer, nullable=False)
+    transaction_id = db.Column(db.Integer)
+    details = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_audit_entries_group_id_id', group_id, id),
+    )
@@ -15,8 +15,8 @@ class Transaction(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    group_id = db.Column(db.Integer, db.ForeignKey('groups.id'), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
+    amount = db.Column(db.Numeric(14, 2), nullable=False)
     type = db.Column(db.String(20), nullable=False)  # 'deposit' or 'withdrawal'
     status = db.Column(db.String(20), default=TransactionStatus.PENDING)  # 'pending', 'approved', 'rejected'
     description = db.Column(db.Text)
@@ -26,12 +26,23 @@ class Transaction(db.Model):
     user = db.relationship('User', back_populates='transactions')
     group = db.relationship('Group', back_populates='transactions')
     
+    __table_args__ = (
+        # Group history listing, newest first with id as the keyset tiebreaker
+        db.Index('ix_transactions_group_id_created_at', group_id, created_at.desc(), id.desc()),
+        # Only the small set of withdrawals still awaiting a decision
+        db.Index(
+            'ix_transactions_pending_withdrawals', group_id, created_at,
+            postgresql_where=db.text("type = 'withdrawal' AND status = 'pending'"),
+            sqlite_where=db.text("type = 'withdrawal' AND status = 'pending'")
+        ),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'user_id': self.user_id,
             'group_id': self.group_id,
-            'amount': self.amount,
+            'amount': float(self.amount),
             'type': self.type,
             'status': self.status,
             'description': self.description,
@@ -1,6 +1,6 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.extensions import db
+from app.utils.passwords import hash_password, verify_password
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -16,16 +16,21 @@ class User(db.Model):
     transactions = db.relationship('Transaction', back_populates='user', cascade='all, delete-orphan')
     created_groups = db.relationship('Group', back_populates='creator')
     
+    __table_args__ = (
+        # Emails are unique regardless of case, and logins look them up by lower(email)
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
+    
     def __init__(self, username, email, password):
         self.username = username
         self.email = email
         self.set_password(password)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
     
     def to_dict(self):
         return {
@@ -2,3 +2,4 @@ from .auth import auth_bp
 from .users import users_bp
 from .groups import groups_bp
 from .transactions import transactions_bp
+from .ops import ops_bp
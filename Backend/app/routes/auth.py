@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app.services.auth_service import register_user, authenticate_user
+import time
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from app.services.auth_service import register_user, authenticate_user, issue_tokens, issue_access_token
 from app.utils.response import success_response, error_response
+from app.utils.tokens import revoke_token
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -16,10 +18,11 @@ def register():
     # Register user
     try:
         user = register_user(data['username'], data['email'], data['password'])
-        access_token = create_access_token(identity=str(user.id))
+        access_token, refresh_token = issue_tokens(user.id)
 
         return success_response({
             'token': access_token,
+            'refresh_token': refresh_token,
             'user': user.to_dict()
         })
     except ValueError as e:
@@ -36,17 +39,29 @@ def login():
     # Authenticate user
     try:
         user = authenticate_user(data['email'], data['password'])
-        access_token = create_access_token(identity=user.id)
+        access_token, refresh_token = issue_tokens(user.id)
         return success_response({
             'token': access_token,
+            'refresh_token': refresh_token,
             'user': user.to_dict()
         })
     except ValueError as e:
         return error_response(str(e), 401)
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    # A new access token with up-to-date role claims
+    access_token = issue_access_token(get_jwt_identity(), get_jwt()['jti'])
+    return success_response({'token': access_token})
+
 @auth_bp.route('/logout', methods=['POST'])
-@jwt_required()
+@jwt_required(verify_type=False)
 def logout():
-    # We don't need to do anything on the server side for JWT logout
-    # Client should remove the token from storage
+    # Revoke the token until it expires, and the refresh token an access
+    # token was issued with
+    claims = get_jwt()
+    revoke_token(claims['jti'], claims['exp'] - time.time())
+    if 'refresh_jti' in claims:
+        revoke_token(claims['refresh_jti'], current_app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds())
     return success_response({'message': 'Successfully logged out'})
@@ -1,19 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.group_service import (
     create_group, get_user_groups, get_group_by_id, 
     update_group, delete_group, join_group, leave_group
 )
 from app.utils.response import success_response, error_response
+from app.utils.pagination import parse_limit
+from app.utils.response_cache import cached_response, depend_on_group
 
 groups_bp = Blueprint('groups', __name__)
 
 @groups_bp.route('', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_groups():
     current_user_id = get_jwt_identity()
     groups = get_user_groups(current_user_id)
-    return success_response([group.to_dict() for group in groups])
+    for group in groups:
+        depend_on_group(group['id'])
+    return success_response(groups)
 
 @groups_bp.route('', methods=['POST'])
 @jwt_required()
@@ -33,6 +38,7 @@ def create_new_group():
 
 @groups_bp.route('/<int:group_id>', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_group(group_id):
     current_user_id = get_jwt_identity()
     group = get_group_by_id(group_id, current_user_id)
@@ -92,13 +98,105 @@ def leave_existing_group(group_id):
 
 @groups_bp.route('/<int:group_id>/transactions', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_group_transactions(group_id):
-    from app.services.transaction_service import get_transactions_by_group
+    from app.services.transaction_service import get_transactions_by_group, iter_transactions_by_group
     
     current_user_id = get_jwt_identity()
+    cursor = request.args.get('cursor')
     
     try:
-        transactions = get_transactions_by_group(group_id, current_user_id)
-        return success_response([t.to_dict() for t in transactions])
+        # Stream the full history as newline-delimited JSON
+        if request.args.get('format') == 'ndjson':
+            transactions = iter_transactions_by_group(group_id, current_user_id, cursor)
+            lines = (current_app.json.dumps(t) + '\n' for t in transactions)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        
+        limit = parse_limit(request.args.get('limit'))
+        transactions, next_cursor = get_transactions_by_group(group_id, current_user_id, limit, cursor)
+        return success_response({
+            'transactions': transactions,
+            'next_cursor': next_cursor
+        })
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+@groups_bp.route('/<int:group_id>/export', methods=['GET'])
+@jwt_required()
+def export_group_transactions(group_id):
+    from app.services.transaction_service import iter_transaction_export
+    from app.utils.export import csv_lines, columnar_lines
+    from app.utils.serializers import transaction_row
+    
+    current_user_id = get_jwt_identity()
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'columnar'):
+        return error_response('Format must be csv or columnar', 400)
+    
+    try:
+        chunks = iter_transaction_export(
+            group_id,
+            current_user_id,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            after=request.args.get('after')
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+    
+    # Rows go out chunk by chunk as they come off the database cursor
+    columns = list(transaction_row.keys)
+    if export_format == 'csv':
+        body, mimetype, extension = csv_lines(columns, chunks), 'text/csv', 'csv'
+    else:
+        body, mimetype, extension = columnar_lines(columns, chunks, current_app.json.dumps), 'application/x-ndjson', 'ndjson'
+    
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=group-{group_id}-transactions.{extension}'
+    return response
+
+@groups_bp.route('/<int:group_id>/summary', methods=['GET'])
+@jwt_required()
+@cached_response
+def get_group_summary_view(group_id):
+    from app.services.summary_service import get_group_summary
+    
+    current_user_id = get_jwt_identity()
+    
+    try:
+        return success_response(get_group_summary(group_id, current_user_id))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+@groups_bp.route('/<int:group_id>/balance', methods=['GET'])
+@jwt_required()
+@cached_response
+def get_group_balance_view(group_id):
+    from app.services.ledger_service import get_group_balance
+    
+    current_user_id = get_jwt_identity()
+    
+    try:
+        return success_response(get_group_balance(group_id, current_user_id, request.args.get('as_of')))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+@groups_bp.route('/<int:group_id>/analytics', methods=['GET'])
+@jwt_required()
+@cached_response
+def get_group_analytics_view(group_id):
+    from app.services.analytics_service import get_contribution_analytics
+    
+    current_user_id = get_jwt_identity()
+    
+    try:
+        return success_response(get_contribution_analytics(
+            group_id,
+            current_user_id,
+            bucket=request.args.get('bucket', 'day'),
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            by_member=request.args.get('by') == 'member'
+        ))
     except ValueError as e:
         return error_response(str(e), 400)
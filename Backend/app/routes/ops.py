@@ -0,0 +1,28 @@
+import hmac
+from flask import Blueprint, current_app, request
+from app.extensions import db
+from app.utils.pool import pool_stats
+from app.utils.response import success_response, error_response
+
+ops_bp = Blueprint('ops', __name__)
+
+@ops_bp.before_request
+def require_ops_token():
+    """
+    Operational endpoints are for operators, not app users: they need the
+    shared OPS_TOKEN and are hidden entirely when it is not configured
+
+    Also guards /api/metrics
+    """
+    expected = current_app.config.get('OPS_TOKEN')
+    if not expected:
+        return error_response('Not found', 404)
+
+    # Scrapers such as Prometheus send it as a bearer token instead
+    token = request.headers.get('X-Ops-Token') or request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(token.encode(), expected.encode()):
+        return error_response('Invalid ops token', 403)
+
+@ops_bp.route('/pool', methods=['GET'])
+def get_pool_stats():
+    return success_response(pool_stats(db.engine))
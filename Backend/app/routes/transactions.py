@@ -1,15 +1,20 @@
+import json
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.transaction_service import (
-    create_contribution, request_withdrawal, 
-    update_withdrawal_status, get_transaction_by_id
+    create_contribution, create_contributions, request_withdrawal, 
+    update_withdrawal_status, get_transaction_by_id,
+    get_pending_withdrawals, decide_withdrawals
 )
 from app.utils.response import success_response, error_response
+from app.utils.pagination import parse_limit
+from app.utils.idempotency import idempotent
 
 transactions_bp = Blueprint('transactions', __name__)
 
 @transactions_bp.route('/transactions', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_transaction():
     current_user_id = get_jwt_identity()
     data = request.get_json()
@@ -24,8 +29,43 @@ def create_transaction():
     except ValueError as e:
         return error_response(str(e), 400)
 
+@transactions_bp.route('/transactions/batch', methods=['POST'])
+@jwt_required()
+@idempotent
+def create_transaction_batch():
+    current_user_id = get_jwt_identity()
+    
+    # Accept an NDJSON upload, a JSON array, or {"contributions": [...]}
+    if request.mimetype == 'application/x-ndjson':
+        items = []
+        for number, line in enumerate(request.get_data(as_text=True).splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                return error_response(f'Invalid JSON on line {number}', 400)
+    else:
+        data = request.get_json()
+        items = data.get('contributions') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return error_response('A non-empty list of contributions is required', 400)
+    
+    try:
+        results = create_contributions(current_user_id, items)
+        created = sum(1 for r in results if r['status'] == 'created')
+        return success_response({
+            'created': created,
+            'failed': len(results) - created,
+            'results': results
+        })
+    except ValueError as e:
+        return error_response(str(e), 400)
+
 @transactions_bp.route('/withdrawals', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_withdrawal_request():
     current_user_id = get_jwt_identity()
     data = request.get_json()
@@ -40,6 +80,43 @@ def create_withdrawal_request():
     except ValueError as e:
         return error_response(str(e), 400)
 
+@transactions_bp.route('/withdrawals/pending', methods=['GET'])
+@jwt_required()
+def get_pending_withdrawal_queue():
+    current_user_id = get_jwt_identity()
+    
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        withdrawals, next_cursor = get_pending_withdrawals(current_user_id, limit, request.args.get('cursor'))
+        return success_response({
+            'withdrawals': withdrawals,
+            'next_cursor': next_cursor
+        })
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+@transactions_bp.route('/withdrawals/decisions', methods=['POST'])
+@jwt_required()
+@idempotent
+def decide_withdrawal_batch():
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    decisions = data.get('decisions') if isinstance(data, dict) else data
+    if not isinstance(decisions, list) or not decisions:
+        return error_response('A non-empty list of decisions is required', 400)
+    
+    try:
+        results = decide_withdrawals(current_user_id, decisions)
+        failed = sum(1 for r in results if r['status'] == 'error')
+        return success_response({
+            'decided': len(results) - failed,
+            'failed': failed,
+            'results': results
+        })
+    except ValueError as e:
+        return error_response(str(e), 400)
+
 @transactions_bp.route('/withdrawals/<int:transaction_id>', methods=['PUT'])
 @jwt_required()
 def update_withdrawal(transaction_id):
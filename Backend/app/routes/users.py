@@ -25,3 +25,11 @@ def update_current_user():
         return success_response(updated_user.to_dict())
     except ValueError as e:
         return error_response(str(e), 400)
+
+@users_bp.route('/me/dashboard', methods=['GET'])
+@jwt_required()
+def get_current_user_dashboard():
+    from app.services.group_service import get_user_dashboard
+    
+    current_user_id = get_jwt_identity()
+    return success_response({'groups': get_user_dashboard(current_user_id)})
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from app.models.analytics import ContributionRollup, RollupWatermark
+from app.models.group import Group
+from app.models.ledger import LedgerEntry
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.ledger_service import SNAPSHOT_LAG
+from app.services.membership_service import is_admin
+from app.extensions import db
+from app.utils.db import dialect_insert
+from app.utils.validators import parse_date
+
+BUCKETS = ('day', 'week', 'month')
+
+def get_contribution_analytics(group_id, user_id, bucket='day', start=None, end=None, by_member=False):
+    """
+    Aggregate a group's settled deposits and withdrawals per time bucket and
+    type (and member, if by_member), for group admins
+
+    Buckets are UTC days, ISO weeks (starting Monday) or calendar months;
+    start and end are inclusive ISO dates. Days rolled up by roll_up (run
+    by `flask analytics rollup`) are read from the rollups, and the days
+    after them from the ledger itself; reading never writes rollups.
+
+    Returns the rows as columns (a list per field) for charting
+    """
+    if not is_admin(user_id, group_id):
+        raise ValueError("You don't have permission to view this group's analytics")
+
+    if bucket not in BUCKETS:
+        raise ValueError(f"Bucket must be one of: {', '.join(BUCKETS)}")
+
+    start = parse_date(start) if start else None
+    end = parse_date(end) if end else None
+    if start and end and start > end:
+        raise ValueError("Start date must not be after end date")
+
+    closed_until = db.session.query(RollupWatermark.rolled_up_until).filter_by(group_id=group_id).scalar()
+
+    totals = {}
+
+    # Rolled-up days from the rollups
+    if closed_until is not None and not (start and start >= closed_until):
+        period = _bucket(ContributionRollup.day, bucket)
+        keys = [period, ContributionRollup.type] + ([ContributionRollup.user_id] if by_member else [])
+        query = db.session.query(
+            *keys, db.func.sum(ContributionRollup.total), db.func.sum(ContributionRollup.count)
+        ).filter(
+            ContributionRollup.group_id == group_id,
+            ContributionRollup.day < closed_until
+        ).group_by(*keys)
+        if start:
+            query = query.filter(ContributionRollup.day >= start)
+        if end:
+            query = query.filter(ContributionRollup.day <= end)
+        _merge(totals, query)
+
+    # The days after them straight from the ledger
+    if closed_until is None or not end or end >= closed_until:
+        since = max((day for day in (closed_until, start) if day is not None), default=None)
+        day = db.func.date(LedgerEntry.created_at, type_=db.Date)
+        period = _bucket(day, bucket)
+        keys = [period, Transaction.type] + ([Transaction.user_id] if by_member else [])
+        query = db.session.query(
+            *keys, db.func.sum(db.func.abs(LedgerEntry.amount, type_=LedgerEntry.amount.type)),
+            db.func.count(LedgerEntry.id)
+        ).join(Transaction, Transaction.id == LedgerEntry.transaction_id).filter(
+            LedgerEntry.group_id == group_id
+        ).group_by(*keys)
+        if since:
+            query = query.filter(LedgerEntry.created_at >= _midnight(since))
+        if end:
+            query = query.filter(LedgerEntry.created_at < _midnight(end + timedelta(days=1)))
+        _merge(totals, query)
+
+    rows = sorted(totals.items())
+    columns = {
+        'period': [key[0].isoformat() for key, _ in rows],
+        'type': [key[1] for key, _ in rows],
+        'total': [float(total) for _, (total, _) in rows],
+        'count': [count for _, (_, count) in rows]
+    }
+
+    result = {
+        'group_id': group_id,
+        'bucket': bucket,
+        'start': start.isoformat() if start else None,
+        'end': end.isoformat() if end else None,
+        'columns': columns
+    }
+
+    if by_member:
+        member_ids = [key[2] for key, _ in rows]
+        columns['user_id'] = member_ids
+        result['members'] = {
+            row.id: row.username
+            for row in db.session.query(User.id, User.username).filter(User.id.in_(set(member_ids)))
+        }
+
+    return result
+
+def roll_up():
+    """
+    Roll up every group's closed days that haven't been rolled up yet,
+    committing after each group
+
+    A day is closed once it ended more than SNAPSHOT_LAG ago, so no
+    uncommitted ledger entries can still land in it. Returns the number of
+    groups rolled up
+    """
+    closed_until = (datetime.utcnow() - SNAPSHOT_LAG).date()
+
+    group_ids = db.session.scalars(
+        db.select(Group.id).outerjoin(RollupWatermark).where(db.or_(
+            RollupWatermark.rolled_up_until.is_(None),
+            RollupWatermark.rolled_up_until < closed_until
+        ))
+    ).all()
+
+    for group_id in group_ids:
+        roll_up_group(group_id, closed_until)
+        db.session.commit()
+
+    return len(group_ids)
+
+def roll_up_group(group_id, closed_until):
+    """
+    Roll up a group's days before closed_until that haven't been rolled up yet
+    """
+    watermark = db.session.query(RollupWatermark.rolled_up_until).filter_by(group_id=group_id).scalar()
+    if watermark is not None and watermark >= closed_until:
+        return
+
+    day = db.func.date(LedgerEntry.created_at, type_=db.Date)
+    daily = db.select(
+        LedgerEntry.group_id, day, Transaction.user_id, Transaction.type,
+        db.func.sum(db.func.abs(LedgerEntry.amount)), db.func.count(LedgerEntry.id)
+    ).join(Transaction, Transaction.id == LedgerEntry.transaction_id).where(
+        LedgerEntry.group_id == group_id,
+        LedgerEntry.created_at < _midnight(closed_until)
+    ).group_by(LedgerEntry.group_id, day, Transaction.user_id, Transaction.type)
+    if watermark is not None:
+        daily = daily.where(LedgerEntry.created_at >= _midnight(watermark))
+
+    # A concurrent run may be rolling up the same days; keep whichever lands first
+    db.session.execute(
+        dialect_insert(ContributionRollup).from_select(
+            ['group_id', 'day', 'user_id', 'type', 'total', 'count'], daily
+        ).on_conflict_do_nothing()
+    )
+
+    insert = dialect_insert(RollupWatermark).values(group_id=group_id, rolled_up_until=closed_until)
+    db.session.execute(insert.on_conflict_do_update(
+        index_elements=['group_id'],
+        set_={'rolled_up_until': insert.excluded.rolled_up_until},
+        where=RollupWatermark.rolled_up_until < insert.excluded.rolled_up_until
+    ))
+
+def _bucket(day, bucket):
+    """
+    Truncate a date expression to the start of its day, week or month
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return db.cast(db.func.date_trunc(bucket, day), db.Date)
+
+    if bucket == 'week':
+        # The coming Sunday (or the day itself), minus six days: ISO week start
+        return db.func.date(day, 'weekday 0', '-6 days', type_=db.Date)
+    if bucket == 'month':
+        return db.func.date(day, 'start of month', type_=db.Date)
+    return db.func.date(day, type_=db.Date)
+
+def _merge(totals, rows):
+    for *key, total, count in rows:
+        key = tuple(key)
+        previous_total, previous_count = totals.get(key, (0, 0))
+        totals[key] = (previous_total + total, previous_count + count)
+
+def _midnight(day):
+    return datetime(day.year, day.month, day.day)
@@ -1,23 +1,31 @@
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jti
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.services.membership_service import get_roles
 from app.extensions import db
+from app.utils.db import violated_unique_field
+from app.utils.passwords import needs_rehash
+from app.utils.replica import stick_to_primary
+
+# Users in more groups than this get tokens without role claims
+MAX_CLAIMED_GROUPS = 100
 
 def register_user(username, email, password):
     """
     Register a new user in the system
     """
-    # Check if username already exists
-    if User.query.filter_by(username=username).first():
-        raise ValueError("Username already exists")
-    
-    # Check if email already exists
-    if User.query.filter_by(email=email).first():
-        raise ValueError("Email already exists")
-    
-    # Create new user
     user = User(username=username, email=email, password=password)
     
+    # Let the unique constraints catch duplicates: one round trip, and no
+    # window for a concurrent signup between a check and the insert
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise_duplicate(e)
+        raise
     
     return user
 
@@ -25,9 +33,49 @@ def authenticate_user(email, password):
     """
     Authenticate a user by email and password
     """
-    user = User.query.filter_by(email=email).first()
+    user = User.query.filter(db.func.lower(User.email) == email.lower()).first()
     
     if not user or not user.check_password(password):
         raise ValueError("Invalid email or password")
     
+    # Upgrade hashes made with older cost parameters while we have the password
+    if needs_rehash(user.password_hash):
+        user.set_password(password)
+        db.session.commit()
+    
     return user
+
+def issue_tokens(user_id):
+    """
+    Create an access token and the refresh token it can be renewed with
+    """
+    # A new session reads from the primary at first, so a user who just
+    # registered is found even if the replica hasn't caught up
+    stick_to_primary(user_id)
+    refresh_token = create_refresh_token(identity=str(user_id))
+    return issue_access_token(user_id, get_jti(refresh_token)), refresh_token
+
+def issue_access_token(user_id, refresh_jti):
+    """
+    Create an access token, carrying the user's group roles when
+    JWT_ROLE_CLAIMS_TTL is set so requests can skip the membership lookups
+    """
+    claims = {'refresh_jti': refresh_jti}
+
+    if current_app.config['JWT_ROLE_CLAIMS_TTL']:
+        roles = get_roles(user_id)
+        # Keep tokens small; members of many groups fall back to lookups
+        if len(roles) <= MAX_CLAIMED_GROUPS:
+            claims['roles'] = {str(group_id): role for group_id, role in roles.items()}
+
+    return create_access_token(identity=str(user_id), additional_claims=claims)
+
+def raise_duplicate(error):
+    """
+    Turn a duplicate username/email IntegrityError into the matching ValueError
+    """
+    field = violated_unique_field(error, ('username', 'email'))
+    if field == 'username':
+        raise ValueError("Username already exists")
+    if field == 'email':
+        raise ValueError("Email already exists")
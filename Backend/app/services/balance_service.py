@@ -0,0 +1,66 @@
+from app.models.group import Group
+from app.models.ledger import LedgerEntry
+from app.services.outbox_service import enqueue
+from app.extensions import db
+from app.utils.validators import MAX_AMOUNT
+
+def credit_group(group_id, entries):
+    """
+    Add transactions' amounts to a group's balance and ledger
+
+    entries is a list of (transaction_id, amount) tuples. The addition
+    happens inside a single UPDATE statement, so concurrent deposits to the
+    same group never overwrite each other's changes. Returns False, leaving
+    the balance untouched, if the group doesn't exist or the balance would
+    go over MAX_AMOUNT.
+    """
+    total = sum(amount for _, amount in entries)
+    group = db.session.execute(
+        db.update(Group)
+        .where(Group.id == group_id, Group.current_amount <= MAX_AMOUNT - total)
+        .values(current_amount=Group.current_amount + total)
+        .returning(Group.current_amount, Group.target_amount)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if group is None:
+        return False
+    
+    _append_entries(group_id, entries, sign=1)
+    
+    # The balance after the update tells whether this credit crossed the goal
+    if group.target_amount and group.current_amount - total < group.target_amount <= group.current_amount:
+        enqueue('group.goal_reached', {
+            'group_id': group_id,
+            'target_amount': str(group.target_amount),
+            'current_amount': str(group.current_amount)
+        })
+    return True
+
+def debit_group(group_id, entries):
+    """
+    Subtract transactions' amounts from a group's balance and add them to
+    its ledger, if the group has enough funds for all of them
+
+    entries is a list of (transaction_id, amount) tuples. The funds check
+    and the subtraction are one conditional UPDATE, so two concurrent
+    withdrawals can't both spend the same money. Returns False, leaving the
+    balance untouched, when the funds are insufficient.
+    """
+    total = sum(amount for _, amount in entries)
+    result = db.session.execute(
+        db.update(Group)
+        .where(Group.id == group_id, Group.current_amount >= total)
+        .values(current_amount=Group.current_amount - total)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    
+    _append_entries(group_id, entries, sign=-1)
+    return True
+
+def _append_entries(group_id, entries, sign):
+    db.session.execute(db.insert(LedgerEntry), [
+        {'group_id': group_id, 'transaction_id': transaction_id, 'amount': sign * amount}
+        for transaction_id, amount in entries
+    ])
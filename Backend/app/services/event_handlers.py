@@ -0,0 +1,49 @@
+import logging
+from app.models.membership import Membership
+from app.models.outbox import AuditEntry
+from app.extensions import db
+from app.utils.db import dialect_insert
+
+# Stand-in for a notification channel: one line per message, with the
+# event id for receivers to drop the duplicates a retried event can cause
+notifications = logging.getLogger('app.notifications')
+
+def on_withdrawal_decided(event):
+    """
+    Audit an admin's decision on a withdrawal and tell the requester
+    """
+    payload = event.payload
+
+    db.session.execute(dialect_insert(AuditEntry).values(
+        event_id=event.id,
+        action=f"withdrawal.{payload['status']}",
+        actor_id=payload['admin_id'],
+        group_id=payload['group_id'],
+        transaction_id=payload['transaction_id'],
+        details={'amount': payload['amount'], 'user_id': payload['user_id']}
+    ).on_conflict_do_nothing(index_elements=['event_id']))
+
+    notifications.info(
+        'event=%s to=user:%s withdrawal %s of %s was %s',
+        event.id, payload['user_id'], payload['transaction_id'], payload['amount'], payload['status']
+    )
+
+def on_goal_reached(event):
+    """
+    Tell every member of a group that it reached its savings goal
+    """
+    payload = event.payload
+
+    member_ids = db.session.scalars(
+        db.select(Membership.user_id).where(Membership.group_id == payload['group_id'])
+    ).all()
+    for user_id in member_ids:
+        notifications.info(
+            'event=%s to=user:%s group %s reached its goal of %s',
+            event.id, user_id, payload['group_id'], payload['target_amount']
+        )
+
+HANDLERS = {
+    'withdrawal.decided': on_withdrawal_decided,
+    'group.goal_reached': on_goal_reached,
+}
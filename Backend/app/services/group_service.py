@@ -1,6 +1,20 @@
 from app.models.group import Group
 from app.models.membership import Membership
+from app.models.member_summary import MemberSummary
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.membership_service import (
+    get_role, is_member, is_admin, invalidate_membership, invalidate_group, ADMIN, MEMBER
+)
 from app.extensions import db
+from app.utils.validators import parse_amount
+from app.utils.serializers import group_row
+from app.utils.response_cache import bump_group_version, bump_user_version
+from app.utils.replica import reads_from_replica
+
+# Groups whose recent transactions are fetched per statement; keeps each
+# UNION ALL well under SQLite's 500-term limit and bounded on PostgreSQL
+RECENT_GROUPS_PER_QUERY = 100
 
 def create_group(user_id, data):
     """
@@ -8,7 +22,7 @@ def create_group(user_id, data):
     """
     name = data.get('name')
     description = data.get('description', '')
-    target_amount = float(data.get('target_amount', 0))
+    target_amount = parse_amount(data.get('target_amount', 0))
     
     # Create group
     group = Group(
@@ -32,27 +46,98 @@ def create_group(user_id, data):
     db.session.add(membership)
     db.session.commit()
     
+    invalidate_membership(user_id, group.id)
+    bump_user_version(user_id)
+    
     return group
 
+@reads_from_replica
 def get_user_groups(user_id):
     """
-    Get all groups a user belongs to
+    Get all groups a user belongs to, serialized for the API
+    """
+    rows = db.session.query(*group_row.columns).join(
+        Membership, Membership.group_id == Group.id
+    ).filter(Membership.user_id == user_id)
+    return [group_row(row) for row in rows]
+
+def get_user_dashboard(user_id, recent_limit=5):
     """
-    memberships = Membership.query.filter_by(user_id=user_id).all()
-    group_ids = [m.group_id for m in memberships]
-    return Group.query.filter(Group.id.in_(group_ids)).all()
+    Get everything the dashboard shows for a user's groups in two queries,
+    or a few more for users in over RECENT_GROUPS_PER_QUERY groups
 
+    Each group comes with the caller's role, the caller's own contribution
+    total, the group's pending withdrawal count and its latest transactions
+    """
+    user_id = int(user_id)
+    
+    # Group-wide pending withdrawal counts from the member summaries
+    pending = db.session.query(
+        MemberSummary.group_id,
+        db.func.sum(MemberSummary.pending_count).label('pending_count')
+    ).filter(
+        MemberSummary.group_id.in_(db.select(Membership.group_id).filter(Membership.user_id == user_id))
+    ).group_by(MemberSummary.group_id).subquery()
+    
+    own = db.aliased(MemberSummary)
+    rows = db.session.query(
+        Group,
+        Membership.is_admin,
+        own.total_deposited,
+        pending.c.pending_count
+    ).join(
+        Membership, Membership.group_id == Group.id
+    ).outerjoin(
+        own, db.and_(own.group_id == Group.id, own.user_id == user_id)
+    ).outerjoin(
+        pending, pending.c.group_id == Group.id
+    ).filter(
+        Membership.user_id == user_id
+    ).order_by(Group.id).all()
+    
+    recent = {}
+    group_ids = [group.id for group, _, _, _ in rows] if recent_limit > 0 else []
+    for start in range(0, len(group_ids), RECENT_GROUPS_PER_QUERY):
+        # The newest few ids per group, each picked by its own index-backed LIMIT
+        latest_ids = db.union_all(*[
+            db.select(
+                db.select(Transaction.id)
+                .filter(Transaction.group_id == group_id)
+                .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+                .limit(recent_limit)
+                .subquery()
+            )
+            for group_id in group_ids[start:start + RECENT_GROUPS_PER_QUERY]
+        ])
+        
+        transactions = Transaction.query.options(
+            db.joinedload(Transaction.user).load_only(User.username)
+        ).filter(
+            Transaction.id.in_(latest_ids)
+        ).order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        
+        for transaction in transactions:
+            recent.setdefault(transaction.group_id, []).append(transaction.to_dict())
+    
+    dashboard = []
+    for group, admin, contributed, pending_count in rows:
+        dashboard.append(dict(
+            group.to_dict(),
+            role=ADMIN if admin else MEMBER,
+            my_contributions=float(contributed or 0),
+            pending_withdrawals=int(pending_count or 0),
+            recent_transactions=recent.get(group.id, [])
+        ))
+    
+    return dashboard
+
+@reads_from_replica
 def get_group_by_id(group_id, user_id):
     """
     Get a specific group if the user is a member
     """
     # Check if user is a member of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id, 
-        group_id=group_id
-    ).first()
-    
-    if not membership:
+    if not is_member(user_id, group_id):
         return None
     
     return Group.query.get(group_id)
@@ -62,13 +147,7 @@ def update_group(group_id, user_id, data):
     Update a group's information if the user is an admin
     """
     # Check if user is an admin of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id, 
-        group_id=group_id,
-        is_admin=True
-    ).first()
-    
-    if not membership:
+    if not is_admin(user_id, group_id):
         raise ValueError("You don't have permission to update this group")
     
     group = Group.query.get(group_id)
@@ -83,9 +162,10 @@ def update_group(group_id, user_id, data):
         group.description = data['description']
     
     if 'target_amount' in data:
-        group.target_amount = float(data['target_amount'])
+        group.target_amount = parse_amount(data['target_amount'])
     
     db.session.commit()
+    bump_group_version(group_id)
     return group
 
 def delete_group(group_id, user_id):
@@ -93,13 +173,7 @@ def delete_group(group_id, user_id):
     Delete a group if the user is an admin
     """
     # Check if user is an admin of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id, 
-        group_id=group_id,
-        is_admin=True
-    ).first()
-    
-    if not membership:
+    if not is_admin(user_id, group_id):
         raise ValueError("You don't have permission to delete this group")
     
     group = Group.query.get(group_id)
@@ -108,6 +182,9 @@ def delete_group(group_id, user_id):
     
     db.session.delete(group)
     db.session.commit()
+    
+    invalidate_group(group_id)
+    bump_group_version(group_id)
 
 def join_group(group_id, user_id):
     """
@@ -119,12 +196,7 @@ def join_group(group_id, user_id):
         raise ValueError("Group not found")
     
     # Check if user is already a member
-    existing_membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=group_id
-    ).first()
-    
-    if existing_membership:
+    if is_member(user_id, group_id):
         raise ValueError("You are already a member of this group")
     
     # Create new membership
@@ -137,6 +209,10 @@ def join_group(group_id, user_id):
     db.session.add(membership)
     db.session.commit()
     
+    invalidate_membership(user_id, group_id)
+    bump_user_version(user_id)
+    bump_group_version(group_id)
+    
     return membership
 
 def leave_group(group_id, user_id):
@@ -144,16 +220,13 @@ def leave_group(group_id, user_id):
     Leave a savings group
     """
     # Check if user is a member
-    membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=group_id
-    ).first()
+    role = get_role(user_id, group_id)
     
-    if not membership:
+    if not role:
         raise ValueError("You are not a member of this group")
     
     # Check if the user is the admin and if they're the only admin
-    if membership.is_admin:
+    if role == ADMIN:
         admin_count = Membership.query.filter_by(
             group_id=group_id,
             is_admin=True
@@ -166,5 +239,9 @@ def leave_group(group_id, user_id):
             if member_count > 1:
                 raise ValueError("You cannot leave the group as you are the only admin. Please make someone else an admin first.")
     
-    db.session.delete(membership)
+    Membership.query.filter_by(user_id=user_id, group_id=group_id).delete()
     db.session.commit()
+    
+    invalidate_membership(user_id, group_id)
+    bump_user_version(user_id)
+    bump_group_version(group_id)
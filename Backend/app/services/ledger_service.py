@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+from app.models.group import Group
+from app.models.ledger import LedgerEntry, BalanceSnapshot
+from app.services.membership_service import is_member
+from app.extensions import db
+
+# Entries newer than this are left out of new snapshots: ids are assigned at
+# insert but become visible at commit, so a recent id gap may still fill in
+SNAPSHOT_LAG = timedelta(minutes=5)
+
+def get_group_balance(group_id, user_id, as_of=None):
+    """
+    Get a group's balance at a point in time from the ledger
+
+    Starts from the latest snapshot taken at or before as_of (default now)
+    and adds the entries after it, up to the next snapshot, so the work is
+    bounded by the snapshot interval rather than the group's history
+    """
+    if not is_member(user_id, group_id):
+        raise ValueError("You are not a member of this group")
+
+    if not db.session.query(Group.id).filter_by(id=group_id).first():
+        raise ValueError("Group not found")
+
+    as_of = parse_timestamp(as_of) if as_of else datetime.utcnow()
+
+    snapshot = BalanceSnapshot.query.filter(
+        BalanceSnapshot.group_id == group_id,
+        BalanceSnapshot.as_of <= as_of
+    ).order_by(BalanceSnapshot.as_of.desc(), BalanceSnapshot.last_entry_id.desc()).first()
+
+    # Entries past the next snapshot are all later than as_of; stopping there
+    # keeps the created_at filter to a bounded range of the (group_id, id) index
+    next_snapshot = BalanceSnapshot.query.filter(
+        BalanceSnapshot.group_id == group_id,
+        BalanceSnapshot.as_of > as_of
+    ).order_by(BalanceSnapshot.as_of, BalanceSnapshot.last_entry_id).first()
+
+    tail = db.session.query(db.func.coalesce(db.func.sum(LedgerEntry.amount), 0)).filter(
+        LedgerEntry.group_id == group_id,
+        LedgerEntry.id > (snapshot.last_entry_id if snapshot else 0),
+        LedgerEntry.created_at <= as_of
+    )
+    if next_snapshot:
+        tail = tail.filter(LedgerEntry.id <= next_snapshot.last_entry_id)
+    tail = tail.scalar()
+
+    balance = (snapshot.balance if snapshot else 0) + tail
+
+    return {
+        'group_id': group_id,
+        'as_of': as_of.isoformat(),
+        'balance': float(balance)
+    }
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp into the naive UTC datetimes the database stores
+    """
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid timestamp, expected ISO 8601")
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def take_snapshots(min_entries=1000):
+    """
+    Snapshot every group with at least min_entries ledger entries since its
+    last snapshot
+
+    Returns the number of snapshots written
+    """
+    cutoff = datetime.utcnow() - SNAPSHOT_LAG
+    groups = _ledger_tails(until=cutoff)
+
+    snapshots = [{
+        'group_id': row.group_id,
+        'last_entry_id': row.last_entry_id,
+        'balance': row.balance + row.tail,
+        'as_of': row.tail_as_of
+    } for row in groups if row.tail_count >= max(min_entries, 1)]
+
+    if snapshots:
+        db.session.execute(db.insert(BalanceSnapshot), snapshots)
+    db.session.commit()
+
+    return len(snapshots)
+
+def verify_ledger(full=False):
+    """
+    Check each group's cached current_amount against its ledger
+
+    Only the entries after each group's latest snapshot are summed, unless
+    full is set, which re-adds the whole ledger and ignores snapshots.
+    Returns a list of (group_id, current_amount, ledger_balance) mismatches
+    """
+    mismatches = []
+    for row in _ledger_tails(full=full):
+        expected = row.balance + row.tail
+        if row.current_amount != expected:
+            mismatches.append((row.group_id, row.current_amount, expected))
+    return mismatches
+
+def _ledger_tails(until=None, full=False):
+    """
+    For every group, its latest snapshot and the entries after it, in one
+    statement so the balances and the ledger are read consistently
+    """
+    latest = db.select(
+        BalanceSnapshot.group_id,
+        db.func.max(BalanceSnapshot.last_entry_id).label('last_entry_id')
+    ).group_by(BalanceSnapshot.group_id).subquery()
+
+    snapshot = db.select(BalanceSnapshot).join(latest, db.and_(
+        BalanceSnapshot.group_id == latest.c.group_id,
+        BalanceSnapshot.last_entry_id == latest.c.last_entry_id
+    )).subquery()
+
+    after = db.func.coalesce(snapshot.c.last_entry_id, 0) if not full else 0
+    entries = db.and_(LedgerEntry.group_id == Group.id, LedgerEntry.id > after)
+
+    # until only decides where the tail ends; every entry up to that id is
+    # part of it, including any with an earlier id but a later created_at
+    entry = db.aliased(LedgerEntry)
+    ending = db.and_(entry.group_id == Group.id, entry.id > after)
+    if until is not None:
+        ending = db.and_(ending, entry.created_at <= until)
+    last = db.select(db.func.max(entry.id)).where(ending).correlate(Group, snapshot).scalar_subquery()
+    covered = db.and_(entries, LedgerEntry.id <= last)
+
+    def tail(column):
+        return db.select(column).where(covered).scalar_subquery()
+
+    query = db.select(
+        Group.id.label('group_id'),
+        Group.current_amount,
+        (db.func.coalesce(snapshot.c.balance, 0) if not full else db.literal(0)).label('balance'),
+        db.func.coalesce(last, snapshot.c.last_entry_id).label('last_entry_id'),
+        db.func.coalesce(tail(db.func.sum(LedgerEntry.amount)), 0).label('tail'),
+        tail(db.func.count(LedgerEntry.id)).label('tail_count'),
+        tail(db.func.max(LedgerEntry.created_at)).label('tail_as_of')
+    ).outerjoin(snapshot, snapshot.c.group_id == Group.id).order_by(Group.id)
+
+    return db.session.execute(query).all()
@@ -0,0 +1,115 @@
+from flask import current_app, g, has_request_context
+from app.models.membership import Membership
+from app.utils.replica import reading_from_replica
+from app.utils.tokens import claimed_role, roles_changed
+from app.utils.validators import parse_id
+
+ADMIN = 'admin'
+MEMBER = 'member'
+
+# Cached marker for "not a member", so negative lookups are memoized too
+_NOT_MEMBER = ''
+_MISSING = object()
+
+def get_role(user_id, group_id):
+    """
+    Get a user's role in a group: 'admin', 'member', or None if not a member
+
+    The request's access token answers when it carries fresh role claims.
+    Otherwise lookups are memoized for the rest of the request and, when
+    MEMBERSHIP_CACHE_TTL is set, in a process-wide TTL/LRU cache
+    """
+    try:
+        key = (parse_id(user_id), parse_id(group_id))
+    except ValueError:
+        # Ids from client input that aren't integers match no membership
+        return None
+
+    memo = _request_memo()
+    role = memo.get(key, _MISSING)
+    if role is not _MISSING:
+        return role or None
+
+    role = claimed_role(*key)
+    if role is not None:
+        memo[key] = role
+        return role or None
+
+    cache = current_app.extensions.get('membership_cache')
+    role = cache.get(key, _MISSING) if cache is not None else _MISSING
+
+    if role is _MISSING:
+        membership = Membership.query.with_entities(Membership.is_admin).filter_by(
+            user_id=key[0],
+            group_id=key[1]
+        ).first()
+
+        if membership is None:
+            role = _NOT_MEMBER
+        else:
+            role = ADMIN if membership.is_admin else MEMBER
+
+        # Writes are authorized from the cache, so keep lagging replica reads out of it
+        if cache is not None and not reading_from_replica():
+            cache.set(key, role)
+
+    memo[key] = role
+    return role or None
+
+def get_roles(user_id):
+    """
+    Get all of a user's roles as {group_id: 'admin' or 'member'}
+    """
+    rows = Membership.query.with_entities(Membership.group_id, Membership.is_admin).filter_by(
+        user_id=parse_id(user_id)
+    )
+    return {row.group_id: ADMIN if row.is_admin else MEMBER for row in rows}
+
+def is_member(user_id, group_id):
+    """
+    Check if a user belongs to a group
+    """
+    return get_role(user_id, group_id) is not None
+
+def is_admin(user_id, group_id):
+    """
+    Check if a user is an admin of a group
+    """
+    return get_role(user_id, group_id) == ADMIN
+
+def invalidate_membership(user_id, group_id):
+    """
+    Forget a cached role after a user joins, leaves or changes role in a group
+    """
+    key = (parse_id(user_id), parse_id(group_id))
+    _request_memo().pop(key, None)
+    roles_changed(user_id=key[0])
+
+    cache = current_app.extensions.get('membership_cache')
+    if cache is not None:
+        cache.delete(key)
+
+def invalidate_group(group_id):
+    """
+    Forget every cached role in a group, e.g. after it is deleted
+    """
+    group_id = parse_id(group_id)
+    memo = _request_memo()
+    for key in [k for k in memo if k[1] == group_id]:
+        del memo[key]
+    roles_changed(group_id=group_id)
+
+    cache = current_app.extensions.get('membership_cache')
+    if cache is not None:
+        cache.delete_where(lambda key: key[1] == group_id)
+
+def _request_memo():
+    """
+    Per-request memo of resolved roles (a throwaway dict outside requests)
+    """
+    if not has_request_context():
+        return {}
+
+    if 'memberships' not in g:
+        g.memberships = {}
+    return g.memberships
@@ -0,0 +1,123 @@
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+from app.models.outbox import OutboxEvent
+from app.extensions import db
+
+logger = logging.getLogger('app.outbox')
+
+# Longest wait between two attempts at a failing event
+MAX_BACKOFF = timedelta(minutes=10)
+
+def enqueue(topic, payload):
+    """
+    Record a side effect to carry out after the current transaction commits
+
+    The event is part of the caller's transaction: it is written by the
+    caller's commit, or not at all if the caller rolls back
+    """
+    enqueue_many(topic, [payload])
+
+def enqueue_many(topic, payloads):
+    """
+    Record one event per payload, in a single INSERT
+    """
+    if payloads:
+        db.session.execute(db.insert(OutboxEvent), [
+            {'topic': topic, 'payload': payload} for payload in payloads
+        ])
+
+def process_batch(batch_size=100):
+    """
+    Carry out up to batch_size due events, oldest first, in one transaction
+
+    Each event's handler runs in a savepoint, so its database writes commit
+    together with the event being marked processed, and a failing handler
+    is rolled back alone and retried later with exponential backoff. After
+    OUTBOX_MAX_ATTEMPTS failures the event is marked failed and left for
+    inspection. Concurrent workers skip each other's claimed rows on
+    PostgreSQL.
+
+    Returns the number of events handled, successfully or not
+    """
+    from app.services.event_handlers import HANDLERS
+
+    now = datetime.utcnow()
+    events = db.session.scalars(
+        db.select(OutboxEvent).where(
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.failed_at.is_(None),
+            OutboxEvent.available_at <= now
+        ).order_by(OutboxEvent.available_at, OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    max_attempts = current_app.config['OUTBOX_MAX_ATTEMPTS']
+    for event in events:
+        event.attempts += 1
+        try:
+            handler = HANDLERS.get(event.topic)
+            if handler is None:
+                raise LookupError(f"No handler for topic {event.topic!r}")
+
+            with db.session.begin_nested():
+                handler(event)
+        except Exception as e:
+            event.last_error = ''.join(traceback.format_exception_only(e)).strip()
+            if event.attempts >= max_attempts:
+                event.failed_at = now
+                logger.error('Outbox event %s (%s) failed for good: %s', event.id, event.topic, event.last_error)
+            else:
+                event.available_at = now + min(timedelta(seconds=2 ** event.attempts), MAX_BACKOFF)
+                logger.warning('Outbox event %s (%s) failed, retrying: %s', event.id, event.topic, event.last_error)
+        else:
+            event.processed_at = now
+
+    db.session.commit()
+    return len(events)
+
+def work(batch_size, poll_interval, once=False, stop=None):
+    """
+    Process batches back to back while events are due, then check again
+    every poll_interval seconds until stop (a threading.Event) is set
+
+    With once, return as soon as no events are due. Returns the number of
+    events handled
+    """
+    stop = stop or threading.Event()
+    handled = 0
+
+    while not stop.is_set():
+        try:
+            count = process_batch(batch_size)
+        except Exception:
+            # e.g. the database went away; keep the worker alive
+            db.session.rollback()
+            if once:
+                raise
+            logger.exception('Outbox batch failed')
+            count = 0
+
+        handled += count
+        if count < batch_size:
+            if once:
+                break
+            stop.wait(poll_interval)
+
+    return handled
+
+def prune_events(older_than):
+    """
+    Delete events processed before older_than (a datetime)
+
+    Failed events are kept until they are dealt with. Returns the number
+    of events deleted
+    """
+    result = db.session.execute(
+        db.delete(OutboxEvent).where(OutboxEvent.processed_at < older_than)
+    )
+    db.session.commit()
+    return result.rowcount
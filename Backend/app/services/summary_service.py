@@ -0,0 +1,143 @@
+from datetime import datetime
+from app.models.group import Group
+from app.models.member_summary import MemberSummary
+from app.models.transaction import Transaction, TransactionType, TransactionStatus
+from app.models.user import User
+from app.services.membership_service import is_member
+from app.extensions import db
+from app.utils.db import dialect_insert
+
+def record_deposits(entries):
+    """
+    Add approved deposits to member summaries
+
+    entries is a list of (group_id, user_id, amount) tuples
+    """
+    _apply_deltas([
+        {'group_id': group_id, 'user_id': user_id, 'total_deposited': amount}
+        for group_id, user_id, amount in entries
+    ])
+
+def record_withdrawal_request(group_id, user_id, amount):
+    """
+    Add a new pending withdrawal to a member's summary
+    """
+    _apply_deltas([
+        {'group_id': group_id, 'user_id': user_id, 'pending_amount': amount, 'pending_count': 1}
+    ])
+
+def record_withdrawal_decision(group_id, user_id, amount, status):
+    """
+    Move a decided withdrawal out of a member's pending totals
+    """
+    record_withdrawal_decisions([(group_id, user_id, amount, status)])
+
+def record_withdrawal_decisions(entries):
+    """
+    Move decided withdrawals out of their members' pending totals
+
+    entries is a list of (group_id, user_id, amount, status) tuples
+    """
+    _apply_deltas([{
+        'group_id': group_id,
+        'user_id': user_id,
+        'pending_amount': -amount,
+        'pending_count': -1,
+        'total_withdrawn': amount if status == TransactionStatus.APPROVED else 0
+    } for group_id, user_id, amount, status in entries])
+
+def get_group_summary(group_id, user_id):
+    """
+    Get a group's totals and per-member breakdown if the user is a member
+    """
+    if not is_member(user_id, group_id):
+        raise ValueError("You are not a member of this group")
+
+    group = Group.query.get(group_id)
+    if not group:
+        raise ValueError("Group not found")
+
+    members = MemberSummary.query.options(
+        db.joinedload(MemberSummary.user).load_only(User.username)
+    ).filter_by(group_id=group_id).order_by(MemberSummary.user_id).all()
+
+    activity = [m.last_activity_at for m in members if m.last_activity_at]
+
+    return {
+        'group_id': group.id,
+        'current_amount': float(group.current_amount),
+        'total_deposited': float(sum(m.total_deposited for m in members)),
+        'total_withdrawn': float(sum(m.total_withdrawn for m in members)),
+        'pending_amount': float(sum(m.pending_amount for m in members)),
+        'pending_count': sum(m.pending_count for m in members),
+        'last_activity_at': max(activity).isoformat() if activity else None,
+        'members': [m.to_dict() for m in members]
+    }
+
+def rebuild_summaries():
+    """
+    Recompute every member summary from the transaction ledger in a single pass
+
+    Returns the number of summary rows written
+    """
+    deposited = db.case(
+        (Transaction.type == TransactionType.DEPOSIT, Transaction.amount), else_=0
+    )
+    withdrawn = db.case(
+        (db.and_(Transaction.type == TransactionType.WITHDRAWAL,
+                 Transaction.status == TransactionStatus.APPROVED), Transaction.amount), else_=0
+    )
+    is_pending = db.and_(Transaction.type == TransactionType.WITHDRAWAL,
+                         Transaction.status == TransactionStatus.PENDING)
+
+    totals = db.select(
+        Transaction.group_id,
+        Transaction.user_id,
+        db.func.sum(deposited),
+        db.func.sum(withdrawn),
+        db.func.sum(db.case((is_pending, Transaction.amount), else_=0)),
+        db.func.sum(db.case((is_pending, 1), else_=0)),
+        db.func.max(Transaction.created_at)
+    ).group_by(Transaction.group_id, Transaction.user_id)
+
+    db.session.execute(db.delete(MemberSummary))
+    result = db.session.execute(
+        db.insert(MemberSummary).from_select([
+            'group_id', 'user_id', 'total_deposited', 'total_withdrawn',
+            'pending_amount', 'pending_count', 'last_activity_at'
+        ], totals)
+    )
+    db.session.commit()
+
+    return result.rowcount
+
+def _apply_deltas(deltas):
+    """
+    Add deltas to member summary rows, creating missing rows, in one statement
+    """
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    columns = ('total_deposited', 'total_withdrawn', 'pending_amount', 'pending_count')
+
+    # Merge deltas for the same member; one statement can't upsert a row twice
+    rows = {}
+    for d in deltas:
+        key = (d['group_id'], d['user_id'])
+        row = rows.setdefault(key, dict({c: 0 for c in columns}, group_id=key[0], user_id=key[1], last_activity_at=now))
+        for c in columns:
+            row[c] += d.get(c, 0)
+
+    insert = dialect_insert(MemberSummary)
+    table = MemberSummary.__table__
+    db.session.execute(
+        insert.on_conflict_do_update(
+            index_elements=['group_id', 'user_id'],
+            set_=dict(
+                {c: table.c[c] + insert.excluded[c] for c in columns},
+                last_activity_at=insert.excluded.last_activity_at
+            )
+        ),
+        list(rows.values())
+    )
@@ -1,7 +1,24 @@
+from datetime import datetime, time, timedelta
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.models.group import Group
 from app.models.membership import Membership
+from app.models.user import User
+from app.services.balance_service import credit_group, debit_group
+from app.services.membership_service import is_member, is_admin
+from app.services.outbox_service import enqueue, enqueue_many
+from app.services.summary_service import (
+    record_deposits, record_withdrawal_request, record_withdrawal_decision,
+    record_withdrawal_decisions
+)
 from app.extensions import db
+from app.utils.validators import parse_amount, parse_date, parse_id
+from app.utils.response_cache import bump_group_version
+from app.utils.serializers import transaction_row
+from app.utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+from app.utils.replica import reads_from_replica
+
+# Upper bound on the number of items accepted in one bulk request
+MAX_BATCH_SIZE = 10000
 
 def create_contribution(user_id, group_id, amount, description=""):
     """
@@ -9,26 +26,16 @@ def create_contribution(user_id, group_id, amount, description=""):
     """
     # Validate amount
     try:
-        amount = float(amount)
+        amount = parse_amount(amount)
         if amount <= 0:
             raise ValueError
     except ValueError:
         raise ValueError("Amount must be a positive number")
     
     # Check if user is a member of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=group_id
-    ).first()
-    
-    if not membership:
+    if not is_member(user_id, group_id):
         raise ValueError("You are not a member of this group")
     
-    # Get the group
-    group = Group.query.get(group_id)
-    if not group:
-        raise ValueError("Group not found")
-    
     # Create transaction
     transaction = Transaction(
         user_id=user_id,
@@ -38,14 +45,121 @@ def create_contribution(user_id, group_id, amount, description=""):
         status=TransactionStatus.APPROVED,  # Deposits are auto-approved
         description=description
     )
+    db.session.add(transaction)
+    db.session.flush()
     
     # Update group's current amount
-    group.current_amount += amount
+    if not credit_group(group_id, [(transaction.id, amount)]):
+        db.session.rollback()
+        if Group.query.get(group_id) is None:
+            raise ValueError("Group not found")
+        raise ValueError("The group's balance can't take this amount")
     
-    db.session.add(transaction)
+    record_deposits([(group_id, int(user_id), amount)])
     db.session.commit()
+    bump_group_version(group_id)
     
-    return transaction
+    return _load_transaction(transaction.id)
+
+def create_contributions(user_id, items):
+    """
+    Create many contribution transactions (deposits) in one database transaction
+
+    Each item is a dict with group_id, amount and optional description; every
+    deposit is made by the user. Membership for the whole batch is checked in
+    one query, rows are bulk inserted and each group's balance is updated once.
+
+    Returns one result per item, in order
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch can contain at most {MAX_BATCH_SIZE} contributions")
+    
+    results = [None] * len(items)
+    accepted = []
+    
+    # Validate each item on its own first
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict) or not all(k in item for k in ('group_id', 'amount')):
+                raise ValueError("Missing required fields")
+            
+            try:
+                group_id = parse_id(item['group_id'])
+            except ValueError:
+                raise ValueError("Invalid group id")
+            
+            try:
+                amount = parse_amount(item['amount'])
+                if amount <= 0:
+                    raise ValueError
+            except ValueError:
+                raise ValueError("Amount must be a positive number")
+            
+            accepted.append((index, group_id, amount, item.get('description', '')))
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+    
+    # Check membership for the whole batch in one query
+    member_of = set()
+    if accepted:
+        member_of = set(db.session.scalars(
+            db.select(Membership.group_id).where(
+                Membership.user_id == int(user_id),
+                Membership.group_id.in_({group_id for _, group_id, _, _ in accepted})
+            )
+        ))
+    
+    inserts = []
+    for index, group_id, amount, description in accepted:
+        if group_id not in member_of:
+            results[index] = {'index': index, 'status': 'error', 'message': "You are not a member of this group"}
+            continue
+        
+        inserts.append((index, {
+            'user_id': int(user_id),
+            'group_id': group_id,
+            'amount': amount,
+            'type': TransactionType.DEPOSIT,
+            'status': TransactionStatus.APPROVED,  # Deposits are auto-approved
+            'description': description
+        }))
+    
+    if inserts:
+        # Bulk insert, getting ids back in parameter order
+        created_ids = db.session.scalars(
+            db.insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+            [row for _, row in inserts]
+        ).all()
+        
+        # One balance update per group and one summary update per member
+        by_group = {}
+        for (_, row), transaction_id in zip(inserts, created_ids):
+            by_group.setdefault(row['group_id'], []).append((transaction_id, row['amount']))
+        
+        full = {group_id for group_id, entries in by_group.items() if not credit_group(group_id, entries)}
+        if full:
+            # Take back the deposits whose group's balance can't take them
+            db.session.execute(db.delete(Transaction).where(Transaction.id.in_(
+                [transaction_id for group_id in full for transaction_id, _ in by_group[group_id]]
+            )))
+        
+        member_totals = {}
+        for (index, row), transaction_id in zip(inserts, created_ids):
+            if row['group_id'] in full:
+                results[index] = {'index': index, 'status': 'error',
+                                  'message': "The group's balance can't take these deposits"}
+                continue
+            
+            key = (row['group_id'], row['user_id'])
+            member_totals[key] = member_totals.get(key, 0) + row['amount']
+            results[index] = {'index': index, 'status': 'created', 'transaction_id': transaction_id}
+        record_deposits([(group_id, member_id, total) for (group_id, member_id), total in member_totals.items()])
+        
+        db.session.commit()
+        for group_id in by_group.keys() - full:
+            bump_group_version(group_id)
+    
+    return results
 
 def request_withdrawal(user_id, group_id, amount, description=""):
     """
@@ -53,19 +167,14 @@ def request_withdrawal(user_id, group_id, amount, description=""):
     """
     # Validate amount
     try:
-        amount = float(amount)
+        amount = parse_amount(amount)
         if amount <= 0:
             raise ValueError
     except ValueError:
         raise ValueError("Amount must be a positive number")
     
     # Check if user is a member of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=group_id
-    ).first()
-    
-    if not membership:
+    if not is_member(user_id, group_id):
         raise ValueError("You are not a member of this group")
     
     # Get the group
@@ -88,16 +197,18 @@ def request_withdrawal(user_id, group_id, amount, description=""):
     )
     
     db.session.add(transaction)
+    record_withdrawal_request(group_id, int(user_id), amount)
     db.session.commit()
+    bump_group_version(group_id)
     
-    return transaction
+    return _load_transaction(transaction.id)
 
 def update_withdrawal_status(transaction_id, admin_id, status):
     """
     Update the status of a withdrawal request
     """
     # Get the transaction
-    transaction = Transaction.query.get(transaction_id)
+    transaction = _load_transaction(transaction_id)
     if not transaction:
         raise ValueError("Transaction not found")
     
@@ -110,57 +221,315 @@ def update_withdrawal_status(transaction_id, admin_id, status):
         raise ValueError("Invalid status")
     
     # Check if the admin is actually an admin of the group
-    admin_membership = Membership.query.filter_by(
-        user_id=admin_id,
-        group_id=transaction.group_id,
-        is_admin=True
-    ).first()
-    
-    if not admin_membership:
+    if not is_admin(admin_id, transaction.group_id):
         raise ValueError("You don't have permission to approve/reject withdrawals")
     
-    # Update the transaction status
-    transaction.status = status
+    # Update the transaction status, only if no other admin got there first
+    result = db.session.execute(
+        db.update(Transaction)
+        .where(Transaction.id == transaction.id, Transaction.status == TransactionStatus.PENDING)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    
+    if result.rowcount != 1:
+        db.session.rollback()
+        raise ValueError("This withdrawal has already been processed")
     
     # If approved, update the group's current amount
-    if status == TransactionStatus.APPROVED:
-        group = Group.query.get(transaction.group_id)
-        group.current_amount -= transaction.amount
+    if status == TransactionStatus.APPROVED and not debit_group(transaction.group_id, [(transaction.id, transaction.amount)]):
+        db.session.rollback()
+        raise ValueError("The group doesn't have enough funds for this withdrawal")
     
+    record_withdrawal_decision(transaction.group_id, transaction.user_id, transaction.amount, status)
+    enqueue('withdrawal.decided', _decision_event(transaction.id, transaction.group_id,
+                                                  transaction.user_id, transaction.amount, status, admin_id))
     db.session.commit()
+    bump_group_version(transaction.group_id)
     
-    return transaction
+    return _load_transaction(transaction.id)
+
+def get_pending_withdrawals(admin_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Get a page of pending withdrawals across every group the user administers,
+    oldest first
+
+    Returns the withdrawals, serialized for the API, and the cursor for
+    the next page
+    """
+    query = db.session.query(*transaction_row.columns).outerjoin(
+        User, User.id == Transaction.user_id
+    ).join(
+        Membership, db.and_(
+            Membership.group_id == Transaction.group_id,
+            Membership.user_id == admin_id,
+            Membership.is_admin.is_(True)
+        )
+    ).filter(
+        # Matches the partial pending-withdrawals index
+        Transaction.type == TransactionType.WITHDRAWAL,
+        Transaction.status == TransactionStatus.PENDING
+    )
+    
+    position = decode_cursor(cursor)
+    if position:
+        query = query.filter(
+            db.tuple_(Transaction.created_at, Transaction.id) > db.tuple_(*position)
+        )
+    
+    rows = query.order_by(Transaction.created_at, Transaction.id).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return [transaction_row(row) for row in rows], next_cursor
 
-def get_transactions_by_group(group_id, user_id):
+def decide_withdrawals(admin_id, decisions):
     """
-    Get all transactions for a group
+    Approve or reject many pending withdrawals in one database transaction
+
+    Each decision is a dict with the withdrawal id and a status. Each group's
+    approvals are paid out with a single conditional balance update; if the
+    group can't cover all of them, they are paid out one at a time in
+    request order and those the balance can no longer cover stay pending.
+
+    Returns one result per decision, in order
+    """
+    if len(decisions) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch can contain at most {MAX_BATCH_SIZE} decisions")
+    
+    results = [None] * len(decisions)
+    requested = {}
+    
+    # Validate each decision on its own first
+    for index, decision in enumerate(decisions):
+        try:
+            if not isinstance(decision, dict) or not all(k in decision for k in ('id', 'status')):
+                raise ValueError("Missing required fields")
+            
+            try:
+                transaction_id = parse_id(decision['id'])
+            except ValueError:
+                raise ValueError("Invalid transaction id")
+            
+            if decision['status'] not in [TransactionStatus.APPROVED, TransactionStatus.REJECTED]:
+                raise ValueError("Invalid status")
+            
+            if transaction_id in requested:
+                raise ValueError("Duplicate decision for this withdrawal")
+            
+            requested[transaction_id] = (index, decision['status'])
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+    
+    if not requested:
+        return results
+    
+    # Keep only withdrawals in groups the user administers
+    admin_groups = db.select(Membership.group_id).filter(
+        Membership.user_id == admin_id,
+        Membership.is_admin.is_(True)
+    )
+    allowed = set(db.session.scalars(
+        db.select(Transaction.id).filter(
+            Transaction.id.in_(requested),
+            Transaction.type == TransactionType.WITHDRAWAL,
+            Transaction.group_id.in_(admin_groups)
+        )
+    ))
+    
+    by_status = {TransactionStatus.APPROVED: [], TransactionStatus.REJECTED: []}
+    for transaction_id, (index, status) in requested.items():
+        if transaction_id in allowed:
+            by_status[status].append(transaction_id)
+        else:
+            results[index] = {'index': index, 'status': 'error',
+                              'message': "Withdrawal not found or you don't have permission to decide it"}
+    
+    decided = []
+    events = []
+    for status, ids in by_status.items():
+        if not ids:
+            continue
+        
+        # Only rows that are still pending change; the rest were decided elsewhere
+        rows = db.session.execute(
+            db.update(Transaction)
+            .where(Transaction.id.in_(ids), Transaction.status == TransactionStatus.PENDING)
+            .values(status=status)
+            .returning(Transaction.id, Transaction.group_id, Transaction.user_id, Transaction.amount)
+            .execution_options(synchronize_session=False)
+        ).all()
+        
+        if status == TransactionStatus.APPROVED:
+            by_group = {}
+            for row in sorted(rows, key=lambda row: requested[row.id][0]):
+                by_group.setdefault(row.group_id, []).append((row.id, row.amount))
+            
+            unfunded = []
+            for group_id, entries in by_group.items():
+                if not debit_group(group_id, entries):
+                    unfunded += [entry[0] for entry in entries if not debit_group(group_id, [entry])]
+            if unfunded:
+                # Put the unfunded approvals back as they were
+                db.session.execute(
+                    db.update(Transaction)
+                    .where(Transaction.id.in_(unfunded))
+                    .values(status=TransactionStatus.PENDING)
+                    .execution_options(synchronize_session=False)
+                )
+                for transaction_id in unfunded:
+                    index = requested[transaction_id][0]
+                    results[index] = {'index': index, 'status': 'error',
+                                      'message': "The group doesn't have enough funds for this withdrawal"}
+                rows = [row for row in rows if row.id not in unfunded]
+        
+        for row in rows:
+            index = requested[row.id][0]
+            results[index] = {'index': index, 'status': status, 'transaction_id': row.id}
+            decided.append((row.group_id, row.user_id, row.amount, status))
+            events.append(_decision_event(row.id, row.group_id, row.user_id, row.amount, status, admin_id))
+    
+    for transaction_id, (index, _) in requested.items():
+        if results[index] is None:
+            results[index] = {'index': index, 'status': 'error',
+                              'message': "This withdrawal has already been processed"}
+    
+    record_withdrawal_decisions(decided)
+    enqueue_many('withdrawal.decided', events)
+    db.session.commit()
+    for group_id in {group_id for group_id, _, _, _ in decided}:
+        bump_group_version(group_id)
+    
+    return results
+
+@reads_from_replica
+def get_transactions_by_group(group_id, user_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Get a page of transactions for a group, newest first
+
+    Returns the transactions, serialized for the API, and the cursor for
+    the next page, which is None once the last page has been reached
     """
     # Check if user is a member of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=group_id
-    ).first()
+    if not is_member(user_id, group_id):
+        raise ValueError("You are not a member of this group")
+    
+    # Fetch one extra row to find out whether another page follows
+    rows = _group_transactions_query(group_id, cursor).limit(limit + 1).all()
     
-    if not membership:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return [transaction_row(row) for row in rows], next_cursor
+
+def iter_transactions_by_group(group_id, user_id, cursor=None, chunk_size=1000):
+    """
+    Stream all transactions for a group, newest first, serialized for the API
+
+    Rows are fetched from a server-side cursor in chunks of chunk_size,
+    so memory use does not grow with the length of the history
+    """
+    # Check if user is a member of the group before streaming starts
+    if not is_member(user_id, group_id):
+        raise ValueError("You are not a member of this group")
+    
+    query = _group_transactions_query(group_id, cursor)
+    return (transaction_row(row) for row in query.yield_per(chunk_size))
+
+def iter_transaction_export(group_id, user_id, start=None, end=None, after=None, chunk_size=1000):
+    """
+    Stream a group's transactions, oldest first, in chunks of rows
+
+    start and end are inclusive ISO dates. after is the id of the last
+    transaction already received, to resume an interrupted export. Rows come
+    from a server-side cursor, chunk_size at a time, and are the raw
+    transaction_row column tuples.
+    """
+    # Check access and arguments before streaming starts
+    if not is_member(user_id, group_id):
         raise ValueError("You are not a member of this group")
     
-    return Transaction.query.filter_by(group_id=group_id).order_by(Transaction.created_at.desc()).all()
+    query = db.select(*transaction_row.columns).outerjoin(
+        User, User.id == Transaction.user_id
+    ).where(Transaction.group_id == group_id)
+    
+    if start:
+        query = query.where(Transaction.created_at >= datetime.combine(parse_date(start), time.min))
+    if end:
+        query = query.where(Transaction.created_at < datetime.combine(parse_date(end) + timedelta(days=1), time.min))
+    
+    if after:
+        try:
+            after = int(after)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid resume position")
+        
+        created_at = db.session.query(Transaction.created_at).filter_by(id=after, group_id=group_id).scalar()
+        if created_at is None:
+            raise ValueError("Invalid resume position")
+        query = query.where(db.tuple_(Transaction.created_at, Transaction.id) > db.tuple_(created_at, after))
+    
+    # Same order as the history index, walked backwards
+    query = query.order_by(Transaction.created_at, Transaction.id)
+    return db.session.execute(query.execution_options(yield_per=chunk_size)).partitions()
+
+def _group_transactions_query(group_id, cursor=None):
+    """
+    Build the keyset-ordered transaction row query for a group
+    """
+    query = db.session.query(*transaction_row.columns).outerjoin(
+        User, User.id == Transaction.user_id
+    ).filter(Transaction.group_id == group_id)
+    
+    position = decode_cursor(cursor)
+    if position:
+        query = query.filter(
+            db.tuple_(Transaction.created_at, Transaction.id) < db.tuple_(*position)
+        )
+    
+    return query.order_by(Transaction.created_at.desc(), Transaction.id.desc())
 
 def get_transaction_by_id(transaction_id, user_id):
     """
     Get a specific transaction if the user has access
     """
-    transaction = Transaction.query.get(transaction_id)
+    transaction = _load_transaction(transaction_id)
     if not transaction:
         return None
     
     # Check if user is a member of the group
-    membership = Membership.query.filter_by(
-        user_id=user_id,
-        group_id=transaction.group_id
-    ).first()
-    
-    if not membership:
+    if not is_member(user_id, transaction.group_id):
         return None
     
     return transaction
+
+def _with_username():
+    """
+    Loader option that fetches the owner's username in the same query,
+    so serializing a list of transactions doesn't lazy-load each user
+    """
+    return db.joinedload(Transaction.user).load_only(User.username)
+
+def _load_transaction(transaction_id):
+    """
+    Load a single transaction together with its owner's username
+    """
+    return Transaction.query.options(_with_username()).get(transaction_id)
+
+def _decision_event(transaction_id, group_id, user_id, amount, status, admin_id):
+    """
+    Outbox payload for a decided withdrawal
+    """
+    return {
+        'transaction_id': transaction_id,
+        'group_id': group_id,
+        'user_id': user_id,
+        'amount': str(amount),
+        'status': status,
+        'admin_id': int(admin_id)
+    }
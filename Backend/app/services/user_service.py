@@ -1,7 +1,10 @@
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.extensions import db
-from werkzeug.security import generate_password_hash
+from app.services.auth_service import raise_duplicate
+from app.utils.replica import reads_from_replica
 
+@reads_from_replica
 def get_user_by_id(user_id):
     """
     Get a user by their ID
@@ -16,23 +19,22 @@ def update_user(user_id, data):
     if not user:
         raise ValueError("User not found")
     
-    # Update fields if they are provided
+    # Update fields if they are provided; the unique constraints reject
+    # a username or email taken by another user
     if 'username' in data:
-        # Check if username is taken by another user
-        existing_user = User.query.filter_by(username=data['username']).first()
-        if existing_user and existing_user.id != user_id:
-            raise ValueError("Username already exists")
         user.username = data['username']
     
     if 'email' in data:
-        # Check if email is taken by another user
-        existing_user = User.query.filter_by(email=data['email']).first()
-        if existing_user and existing_user.id != user_id:
-            raise ValueError("Email already exists")
         user.email = data['email']
     
     if 'password' in data:
         user.set_password(data['password'])
     
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise_duplicate(e)
+        raise
+    
     return user
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from werkzeug.utils import import_string
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded LRU cache whose entries expire after a
+    fixed time to live (in seconds)
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+
+            # Evict the least recently used entries
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """
+        Remove every entry whose key matches the predicate
+        """
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class CacheBackend:
+    """
+    Interface for the key/value stores behind shared caches
+
+    Keys are strings and values are plain Python data, so an implementation
+    can keep them outside the process and share them between workers
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process LRU backend
+
+    Each worker process gets its own copy, so it is only consistent when
+    the app runs in a single process
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._cache.set(key, value, ttl)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+def make_backend(app, name, size, ttl):
+    """
+    Build the CacheBackend a *_BACKEND setting names
+
+    'local' is an in-process LocalCacheBackend of size entries expiring
+    after ttl seconds, only consistent when the app runs in a single
+    process; any other value is the import path of a CacheBackend class,
+    which is called with the app. Empty gives None.
+    """
+    if not name:
+        return None
+    if name == 'local':
+        return LocalCacheBackend(maxsize=size, ttl=ttl)
+    return import_string(name)(app)
@@ -0,0 +1,44 @@
+import sqlite3
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from app.extensions import db
+
+@event.listens_for(Engine, 'connect')
+def enforce_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    Turn on foreign keys for SQLite connections, which leave them off, so
+    ON DELETE actions run there as they do on PostgreSQL
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute('PRAGMA foreign_keys = ON')
+
+def dialect_insert(model):
+    """
+    Build an INSERT for a model that supports ON CONFLICT clauses
+    (on_conflict_do_update / on_conflict_do_nothing)
+    """
+    dialect = db.session.get_bind(mapper=inspect(model)).dialect.name
+    
+    if dialect == 'postgresql':
+        return postgresql.insert(model)
+    if dialect == 'sqlite':
+        return sqlite.insert(model)
+    
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+def violated_unique_field(error, fields):
+    """
+    Name which of fields a unique-constraint IntegrityError was raised for,
+    or None if it was another constraint
+
+    Checks the constraint name where the driver reports it (PostgreSQL) and
+    the error message otherwise (SQLite names the column or index there)
+    """
+    diag = getattr(error.orig, 'diag', None)
+    source = (getattr(diag, 'constraint_name', None) or str(error.orig)).lower()
+    
+    for field in fields:
+        if field in source:
+            return field
+    return None
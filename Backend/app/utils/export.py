@@ -0,0 +1,45 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+
+def csv_lines(columns, chunks):
+    """
+    Encode chunks of rows as CSV text, one string per chunk after the header
+
+    Money stays exact (Decimal as written) and datetimes are ISO 8601
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    for rows in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield _drain(buffer)
+
+def columnar_lines(columns, chunks, dumps):
+    """
+    Encode chunks of rows as newline-delimited JSON, one object per chunk
+    holding a list of values per column
+
+    Each line parses on its own, so a dropped download can be resumed
+    from the last id of the last complete line
+    """
+    for rows in chunks:
+        data = {name: values for name, values in zip(columns, map(list, zip(*rows)))}
+        yield dumps({'rows': len(rows), 'columns': data}) + '\n'
+
+def _csv_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
@@ -0,0 +1,183 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from app.models.idempotency import IdempotencyKey
+from app.extensions import db
+from app.utils.db import dialect_insert
+from app.utils.replica import RoutingSession
+from app.utils.response import error_response
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Session.info key of the claim held by the view that is running
+CLAIM = 'idempotency_claim'
+
+class ClaimLost(Exception):
+    """
+    Raised on commit when a retry took over the running request's claim
+    """
+
+def idempotent(fn):
+    """
+    Decorator that lets clients retry a POST safely with an Idempotency-Key header
+
+    The first request with a key runs the view and stores its response;
+    retries with the same key and the same request get the stored response
+    back (marked with an Idempotent-Replayed header) without running the
+    view again. Keys are per user and expire after IDEMPOTENCY_KEY_TTL.
+    Responses with a 5xx status are not stored, so those can be retried.
+    Must be applied below @jwt_required.
+
+    Every commit the view makes also marks its claim applied, in the same
+    transaction, so the claim of a request whose money movement may have
+    committed is never taken over. Only a claim still unapplied after
+    IDEMPOTENCY_LEASE (its request died before committing) is freed for a
+    retry to run the view again; the old request's commit then fails
+    instead of landing too. A request that committed but never stored its
+    response leaves retries with 409 until the key expires.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return fn(*args, **kwargs)
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return error_response(f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters', 400)
+
+        user_id = int(get_jwt_identity())
+        fingerprint = hashlib.sha256(b'\n'.join([
+            request.method.encode(), request.full_path.encode(), request.get_data()
+        ])).hexdigest()
+
+        claimed_at = datetime.utcnow()
+        earlier = _reserve(user_id, key, fingerprint, claimed_at)
+        if earlier is not None:
+            if earlier.fingerprint != fingerprint:
+                return error_response(f'This {HEADER} was already used for a different request', 422)
+            if earlier.status_code is None:
+                if earlier.applied_at is not None and earlier.created_at < claimed_at - current_app.config['IDEMPOTENCY_LEASE']:
+                    return error_response(f'The request with this {HEADER} was carried out, but its response was lost', 409)
+                return error_response(f'A request with this {HEADER} is still being processed', 409)
+
+            response = current_app.response_class(earlier.body, status=earlier.status_code, mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        session = db.session()
+        session.info[CLAIM] = (user_id, key, claimed_at)
+        try:
+            response = current_app.make_response(fn(*args, **kwargs))
+        except ClaimLost:
+            db.session.rollback()
+            return error_response(f'A request with this {HEADER} is still being processed', 409)
+        except Exception:
+            _release(user_id, key, claimed_at)
+            raise
+        finally:
+            session.info.pop(CLAIM, None)
+
+        if response.status_code >= 500:
+            _release(user_id, key, claimed_at)
+        else:
+            # Only into our own claim, in case a retry took over an expired lease
+            db.session.execute(
+                db.update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                       IdempotencyKey.created_at == claimed_at)
+                .values(status_code=response.status_code, body=response.get_data(as_text=True))
+            )
+            db.session.commit()
+        return response
+    return wrapper
+
+def prune_idempotency_keys():
+    """
+    Delete keys older than IDEMPOTENCY_KEY_TTL
+
+    Returns the number of keys deleted
+    """
+    result = db.session.execute(
+        db.delete(IdempotencyKey).where(IdempotencyKey.created_at < _expired_before())
+    )
+    db.session.commit()
+    return result.rowcount
+
+def _reserve(user_id, key, fingerprint, claimed_at):
+    """
+    Claim a key for the current request, in a transaction of its own so
+    concurrent retries see the claim
+
+    Returns None once claimed, or the row of the earlier request holding it
+    """
+    # An expired key is free again, even if it hasn't been pruned yet, and
+    # so is a claim whose request committed nothing within its lease
+    lease = current_app.config['IDEMPOTENCY_LEASE']
+    db.session.execute(db.delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        db.or_(
+            IdempotencyKey.created_at < _expired_before(),
+            db.and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.applied_at.is_(None),
+                IdempotencyKey.created_at < claimed_at - lease
+            )
+        )
+    ))
+    result = db.session.execute(
+        dialect_insert(IdempotencyKey)
+        .values(user_id=user_id, key=key, fingerprint=fingerprint, created_at=claimed_at)
+        .on_conflict_do_nothing()
+    )
+    db.session.commit()
+
+    if result.rowcount == 1:
+        return None
+
+    # The holder may have released the key in the meantime; report it as
+    # still running and let the client retry
+    return db.session.get(IdempotencyKey, (user_id, key)) or IdempotencyKey(fingerprint=fingerprint)
+
+def _release(user_id, key, claimed_at):
+    """
+    Give up a claimed key after the view failed, so a retry runs it again,
+    unless the view already committed
+    """
+    db.session.rollback()
+    db.session.execute(db.delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at == claimed_at,
+        IdempotencyKey.applied_at.is_(None)
+    ))
+    db.session.commit()
+
+@event.listens_for(RoutingSession, 'before_commit')
+def _mark_applied(session):
+    """
+    Mark the running view's claim applied in the transaction it commits
+
+    Fails the commit if the claim is gone, i.e. a retry took it over after
+    the lease ran out, so the two can't both move money.
+    """
+    claim = session.info.get(CLAIM)
+    if claim is None:
+        return
+
+    user_id, key, claimed_at = claim
+    result = session.execute(
+        db.update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+               IdempotencyKey.created_at == claimed_at)
+        .values(applied_at=db.func.coalesce(IdempotencyKey.applied_at, datetime.utcnow()))
+    )
+    if result.rowcount != 1:
+        raise ClaimLost()
+
+def _expired_before():
+    return datetime.utcnow() - current_app.config['IDEMPOTENCY_KEY_TTL']
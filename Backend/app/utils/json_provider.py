@@ -0,0 +1,56 @@
+from datetime import date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the standard library
+    orjson = None
+
+def _default(o):
+    """
+    Encode values the JSON encoders don't handle natively
+    """
+    # Flask's default encoder would render dates as HTTP dates
+    if isinstance(o, date):
+        return o.isoformat()
+
+    # Money columns are cents-precision Decimals, exact as JSON numbers
+    if isinstance(o, Decimal):
+        return float(o)
+
+    return DefaultJSONProvider.default(o)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson when it is installed
+
+    Datetimes are written as ISO 8601 strings and Decimals as numbers on
+    both the orjson and the standard library path, matching what the
+    models' to_dict methods produce
+    """
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b'\n', mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
@@ -1,7 +1,7 @@
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from app.models.membership import Membership
+from app.services.membership_service import is_admin
 
 def admin_required(fn):
     """
@@ -14,13 +14,7 @@ def admin_required(fn):
         group_id = kwargs.get('group_id')
         
         # Check if user is an admin of the group
-        membership = Membership.query.filter_by(
-            user_id=current_user_id,
-            group_id=group_id,
-            is_admin=True
-        ).first()
-        
-        if not membership:
+        if group_id is None or not is_admin(current_user_id, group_id):
             return jsonify({
                 'status': 'error',
                 'message': 'Admin privileges required'
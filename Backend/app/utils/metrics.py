@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.sql')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 25, 50, 100)
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        """
+        Yield (le, cumulative count) pairs, ending with +Inf
+        """
+        total = 0
+        for le, n in zip(self.buckets + ('+Inf',), self.counts):
+            total += n
+            yield le, total
+
+class MetricsRegistry:
+    """
+    Thread-safe store of request and SQL metrics for one app
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.latency = {}
+        self.statements = {}
+        self.sql_seconds = {}
+        self.slow_queries = 0
+
+    def observe_request(self, method, route, status, duration, statements, sql_seconds):
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            route_key = (method, route)
+            self.latency.setdefault(route_key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.statements.setdefault(route_key, Histogram(STATEMENT_BUCKETS)).observe(statements)
+            self.sql_seconds[route_key] = self.sql_seconds.get(route_key, 0.0) + sql_seconds
+
+    def observe_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self, extra_gauges=None):
+        """
+        Render every metric in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            lines += _header('http_requests_total', 'counter', 'HTTP requests by route and status')
+            for (method, route, status), n in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{_labels(method=method, route=route, status=status)} {n}')
+
+            _render_histograms(lines, 'http_request_duration_seconds', 'Request latency', self.latency)
+            _render_histograms(lines, 'http_request_sql_statements', 'SQL statements per request', self.statements)
+
+            lines += _header('http_request_sql_seconds_total', 'counter', 'Time spent in SQL by route')
+            for (method, route), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'http_request_sql_seconds_total{_labels(method=method, route=route)} {seconds:.6f}')
+
+            lines += _header('db_slow_queries_total', 'counter', 'Statements slower than SLOW_QUERY_MS')
+            lines.append(f'db_slow_queries_total {self.slow_queries}')
+
+        for name, (help_text, value) in (extra_gauges or {}).items():
+            lines += _header(name, 'gauge', help_text)
+            lines.append(f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+def init_metrics(app):
+    """
+    Record latency, status and SQL usage for every request of the app
+    """
+    app.extensions['metrics'] = MetricsRegistry()
+    _listen_for_statements()
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # Streamed bodies are timed up to their first byte
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            app.extensions['metrics'].observe_request(
+                request.method, route, response.status_code,
+                time.perf_counter() - started, g.sql_statements, g.sql_seconds
+            )
+        return response
+
+_listening = False
+
+def _listen_for_statements():
+    """
+    Time every statement on every engine (registered once per process)
+    """
+    global _listening
+    if _listening:
+        return
+    _listening = True
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+
+        if has_request_context() and 'sql_statements' in g:
+            g.sql_statements += 1
+            g.sql_seconds += elapsed
+
+        if has_app_context() and 'metrics' in current_app.extensions:
+            threshold = current_app.config.get('SLOW_QUERY_MS', 0)
+            if threshold and elapsed * 1000 >= threshold:
+                current_app.extensions['metrics'].observe_slow_query()
+                logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement)
+
+    @event.listens_for(Engine, 'handle_error')
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        started = context.connection.info.get('query_started') if context.connection is not None else None
+        if started:
+            started.pop()
+
+def _header(name, kind, help_text):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _render_histograms(lines, name, help_text, histograms):
+    lines += _header(name, 'histogram', help_text)
+    for (method, route), histogram in sorted(histograms.items()):
+        for le, count in histogram.samples():
+            lines.append(f'{name}_bucket{_labels(method=method, route=route, le=le)} {count}')
+        lines.append(f'{name}_sum{_labels(method=method, route=route)} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{_labels(method=method, route=route)} {histogram.count}')
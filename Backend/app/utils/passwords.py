@@ -0,0 +1,103 @@
+import atexit
+import os
+import threading
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+_pool = None
+_pool_pid = None
+_slots = None
+_lock = threading.Lock()
+
+def hash_password(password):
+    """
+    Hash a password with the configured PASSWORD_HASH_METHOD, off the
+    request thread when a hashing pool is configured
+    """
+    return _run(generate_password_hash, password, normalize_method(_setting('PASSWORD_HASH_METHOD', DEFAULT_METHOD)))
+
+def verify_password(password_hash, password):
+    """
+    Check a password against a stored hash, off the request thread when a
+    hashing pool is configured
+    """
+    return _run(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    """
+    Check if a stored hash was made with other parameters than the configured ones
+    """
+    method = password_hash.split('$', 1)[0]
+    return method != normalize_method(_setting('PASSWORD_HASH_METHOD', DEFAULT_METHOD))
+
+def normalize_method(method):
+    """
+    Spell out werkzeug's defaults, e.g. 'scrypt' -> 'scrypt:32768:8:1', so
+    methods compare equal to the prefix werkzeug stores in the hash
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        return DEFAULT_METHOD
+    if name == 'pbkdf2' and len(args) < 2:
+        return f"pbkdf2:{args[0] if args else 'sha256'}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+def _setting(name, default):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+def _run(fn, *args):
+    workers = _setting('PASSWORD_HASH_WORKERS', 0)
+    if not workers:
+        return fn(*args)
+
+    # Only servers that hash in a pool pay for importing multiprocessing
+    from concurrent.futures.process import BrokenProcessPool
+
+    pool, slots = _get_pool(workers)
+
+    # Bound the work queued behind the pool, so a login storm backs up in
+    # the callers instead of piling up inside the executor
+    with slots:
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            _discard_pool(pool)
+            return fn(*args)
+
+def _get_pool(workers):
+    """
+    The process's hashing pool, created lazily so each forked server worker
+    gets its own
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool, _pool_pid, _slots
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # Forking the threaded server process directly can deadlock the
+            # child; a forkserver forks from a clean single-threaded process
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+            else:
+                context = multiprocessing.get_context('spawn')
+
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(workers * _setting('PASSWORD_HASH_QUEUE_PER_WORKER', 4))
+        return _pool, _slots
+
+def _discard_pool(pool):
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts wait for a free connection
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+
+    def wait_stats(self):
+        with self._stats_lock:
+            waits = self._checkouts + self._timeouts
+            return {
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'wait_total_ms': round(self._wait_total * 1000, 3),
+                'wait_max_ms': round(self._wait_max * 1000, 3),
+                'wait_avg_ms': round(self._wait_total * 1000 / waits, 3) if waits else 0.0
+            }
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record(time.perf_counter() - start, timed_out=True)
+            raise
+        self._record(time.perf_counter() - start)
+        return connection
+
+    def _record(self, waited, timed_out=False):
+        with self._stats_lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+def pool_stats(engine):
+    """
+    Snapshot of an engine's connection pool usage
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+            'timeout': pool.timeout()
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.wait_stats())
+
+    return stats
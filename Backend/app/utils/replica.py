@@ -0,0 +1,107 @@
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from app.config import engine_options
+from app.utils.cache import make_backend
+
+REPLICA = 'replica'
+READ_METHODS = ('GET', 'HEAD')
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to the replica engine while a function
+    decorated with reads_from_replica is running
+
+    Flushes and every other statement go to the primary.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None and self.info.get(REPLICA)
+            and not self._flushing and getattr(clause, 'is_select', False)
+        ):
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def init_replica(app):
+    """
+    Add the DATABASE_REPLICA_URI bind and the store of users whose reads
+    stick to the primary, named by REPLICA_STICKY_BACKEND. Does nothing
+    without a replica URI.
+    """
+    uri = app.config['DATABASE_REPLICA_URI']
+    app.extensions['replica_sticky'] = None
+    if not uri:
+        return
+
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds[REPLICA] = {'url': uri, **engine_options(uri, app.config['DB_POOL_PROFILE'])}
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+    app.extensions['replica_sticky'] = make_backend(
+        app, app.config['REPLICA_STICKY_BACKEND'],
+        app.config['REPLICA_STICKY_SIZE'], app.config['REPLICA_STICKY_SECONDS']
+    )
+
+    @app.after_request
+    def stick_writers_to_primary(response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            user_id = _current_user_id()
+            if user_id is not None:
+                stick_to_primary(user_id)
+        return response
+
+def stick_to_primary(user_id):
+    """
+    Read from the primary for the user for the next REPLICA_STICKY_SECONDS,
+    so they see their own writes even while the replica lags behind
+    """
+    backend = current_app.extensions.get('replica_sticky')
+    if backend is not None:
+        backend.set(f'sticky:{int(user_id)}', True, ttl=current_app.config['REPLICA_STICKY_SECONDS'])
+
+def reads_from_replica(fn):
+    """
+    Decorator for read-only service functions whose queries may be served
+    by the replica
+
+    Only reads made for GET requests go there, and not those of a user who
+    changed something in the last REPLICA_STICKY_SECONDS. Everything else,
+    including lazy loads after the function returned, uses the primary.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if reading_from_replica() or not _replica_allowed():
+            return fn(*args, **kwargs)
+
+        # Tells the response cache not to store what may be stale
+        g.replica_read = True
+        session = current_app.extensions['sqlalchemy'].session()
+        session.info[REPLICA] = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session.info[REPLICA] = False
+    return wrapper
+
+def reading_from_replica():
+    """
+    Whether the current session's reads are being sent to the replica
+    """
+    return bool(current_app.extensions['sqlalchemy'].session().info.get(REPLICA))
+
+def _replica_allowed():
+    backend = current_app.extensions.get('replica_sticky')
+    if backend is None or not has_request_context() or request.method not in READ_METHODS:
+        return False
+
+    user_id = _current_user_id()
+    return user_id is not None and backend.get(f'sticky:{user_id}') is None
+
+def _current_user_id():
+    try:
+        user_id = get_jwt_identity()
+    except RuntimeError:
+        # No token verified in this request
+        return None
+    return int(user_id) if user_id is not None else None
@@ -0,0 +1,112 @@
+import hashlib
+import uuid
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from flask_jwt_extended import get_jwt_identity
+from app.utils.cache import make_backend
+
+def init_response_cache(app):
+    """
+    Set up the response cache backend named by RESPONSE_CACHE_BACKEND;
+    empty disables caching
+    """
+    app.extensions['response_cache'] = make_backend(
+        app, app.config.get('RESPONSE_CACHE_BACKEND'),
+        app.config['RESPONSE_CACHE_SIZE'], app.config['RESPONSE_CACHE_TTL']
+    )
+
+def bump_group_version(group_id):
+    """
+    Invalidate cached responses that depend on a group
+    """
+    _bump(f'group:{int(group_id)}')
+
+def bump_user_version(user_id):
+    """
+    Invalidate cached responses that depend on a user's set of groups
+    """
+    _bump(f'user:{int(user_id)}')
+
+def depend_on_group(group_id):
+    """
+    Mark the response being built as depending on a group
+    """
+    _depend_on(f'group:{int(group_id)}')
+
+def cached_response(fn):
+    """
+    Decorator that caches a GET view's successful response per (user, URL)
+
+    A cached response is reused only while the versions of everything it
+    depends on are unchanged: the caller's group set, the group in the URL,
+    and any groups the view registers with depend_on_group. Responses carry
+    an ETag, and a matching If-None-Match is answered with 304.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        backend = current_app.extensions.get('response_cache')
+        if backend is None or request.method != 'GET':
+            return fn(*args, **kwargs)
+
+        user_id = get_jwt_identity()
+        key = f'response:{user_id}:{request.full_path}'
+
+        entry = backend.get(key)
+        if entry and all(_version(dep) == token for dep, token in entry['deps'].items()):
+            response = current_app.response_class(entry['body'], status=200, mimetype=entry['mimetype'])
+            response.set_etag(entry['etag'])
+            return response.make_conditional(request)
+
+        # Take version snapshots before reading, so a concurrent change
+        # leaves the new entry stale rather than wrongly fresh
+        g.response_cache_deps = {}
+        _depend_on(f'user:{int(user_id)}')
+        if 'group_id' in kwargs:
+            depend_on_group(kwargs['group_id'])
+
+        response = current_app.make_response(fn(*args, **kwargs))
+        # Replica reads may lag behind the versions taken above
+        if response.status_code != 200 or response.is_streamed or g.get('replica_read'):
+            return response
+
+        body = response.get_data()
+        etag = hashlib.sha1(body).hexdigest()
+        backend.set(key, {
+            'body': body,
+            'mimetype': response.mimetype,
+            'etag': etag,
+            'deps': g.pop('response_cache_deps')
+        })
+
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    return wrapper
+
+def _backend():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('response_cache')
+
+def _version(dep):
+    """
+    Current version token of a dependency
+
+    Tokens are random rather than counters, so a token evicted from the
+    backend and recreated can never match an entry cached before
+    """
+    backend = _backend()
+    token = backend.get(f'version:{dep}')
+    if token is None:
+        token = uuid.uuid4().hex
+        backend.set(f'version:{dep}', token)
+    return token
+
+def _bump(dep):
+    backend = _backend()
+    if backend is not None:
+        backend.set(f'version:{dep}', uuid.uuid4().hex)
+
+def _depend_on(dep):
+    deps = g.get('response_cache_deps')
+    if deps is not None and dep not in deps:
+        deps[dep] = _version(dep)
@@ -0,0 +1,51 @@
+from app.models.group import Group
+from app.models.transaction import Transaction
+from app.models.user import User
+
+class RowSerializer:
+    """
+    Builds API dicts straight from rows of selected columns
+
+    Querying only these columns skips ORM object construction and the
+    per-row to_dict call; datetimes and Decimals are left as they are for
+    the JSON provider to encode
+    """
+
+    def __init__(self, columns, finish=None):
+        self.columns = list(columns.values())
+        self.keys = tuple(columns)
+        self._finish = finish
+
+    def __call__(self, row):
+        data = dict(zip(self.keys, row))
+        if self._finish:
+            self._finish(data)
+        return data
+
+def _group_progress(data):
+    target = data['target_amount']
+    data['progress'] = float(round(data['current_amount'] / target * 100, 2)) if target > 0 else 0
+
+# Same shape as Transaction.to_dict; needs an outer join to users for the username
+transaction_row = RowSerializer({
+    'id': Transaction.id,
+    'user_id': Transaction.user_id,
+    'group_id': Transaction.group_id,
+    'amount': Transaction.amount,
+    'type': Transaction.type,
+    'status': Transaction.status,
+    'description': Transaction.description,
+    'created_at': Transaction.created_at,
+    'username': User.username
+})
+
+# Same shape as Group.to_dict
+group_row = RowSerializer({
+    'id': Group.id,
+    'name': Group.name,
+    'description': Group.description,
+    'target_amount': Group.target_amount,
+    'current_amount': Group.current_amount,
+    'created_by': Group.created_by,
+    'created_at': Group.created_at
+}, finish=_group_progress)
@@ -0,0 +1,85 @@
+import math
+import time
+from flask import current_app, has_request_context
+from flask_jwt_extended import get_jwt
+from app.extensions import jwt
+from app.utils.cache import make_backend
+
+def init_tokens(app):
+    """
+    Set up the store of revoked tokens and recent role changes named by
+    TOKEN_STORE_BACKEND
+    """
+    app.extensions['token_store'] = make_backend(
+        app, app.config['TOKEN_STORE_BACKEND'],
+        app.config['TOKEN_STORE_SIZE'], app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds()
+    )
+
+def revoke_token(jti, ttl):
+    """
+    Reject a token from now on; ttl (in seconds) must cover its remaining lifetime
+    """
+    if ttl > 0:
+        _backend().set(f'revoked:{jti}', True, ttl=math.ceil(ttl))
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    # Revoking a refresh token also revokes the access tokens issued with it
+    backend = _backend()
+    return any(
+        backend.get(f'revoked:{jti}') is not None
+        for jti in (jwt_payload['jti'], jwt_payload.get('refresh_jti')) if jti
+    )
+
+def claimed_role(user_id, group_id):
+    """
+    A user's role in a group according to the request's access token:
+    'admin', 'member', '' if not a member, or None if the token can't tell
+
+    Role claims are only trusted for JWT_ROLE_CLAIMS_TTL seconds after the
+    token was issued, and not at all once the user's or the group's roles
+    changed after that
+    """
+    ttl = current_app.config['JWT_ROLE_CLAIMS_TTL']
+    if not ttl or not has_request_context():
+        return None
+
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        # No token verified in this request
+        return None
+
+    roles = claims.get('roles')
+    if roles is None or claims.get('sub') != str(user_id):
+        return None
+
+    issued_at = claims['iat']
+    if time.time() - issued_at > ttl:
+        return None
+
+    backend = _backend()
+    for key in (f'roles:user:{int(user_id)}', f'roles:group:{int(group_id)}'):
+        changed_at = backend.get(key)
+        if changed_at is not None and changed_at >= issued_at:
+            return None
+
+    return roles.get(str(int(group_id)), '')
+
+def roles_changed(user_id=None, group_id=None):
+    """
+    Stop trusting role claims issued before now for a user or a group
+    """
+    ttl = current_app.config['JWT_ROLE_CLAIMS_TTL']
+    if not ttl:
+        return
+
+    # Claims older than the TTL aren't trusted anyway, so the marker can expire with them
+    backend = _backend()
+    if user_id is not None:
+        backend.set(f'roles:user:{int(user_id)}', time.time(), ttl=ttl + 1)
+    if group_id is not None:
+        backend.set(f'roles:group:{int(group_id)}', time.time(), ttl=ttl + 1)
+
+def _backend():
+    return current_app.extensions['token_store']
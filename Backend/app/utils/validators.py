@@ -1,3 +1,12 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Money is held as Decimal rounded to whole cents
+CENT = Decimal('0.01')
+
+# Largest amount the Numeric(14, 2) money columns hold
+MAX_AMOUNT = Decimal('999999999999.99')
+
 def validate_email(email):
     """
     Validate email format
@@ -13,3 +22,52 @@ def validate_password(password):
     # At least 8 characters, at least one letter and one number
     import re
     return len(password) >= 8 and re.search(r'[A-Za-z]', password) and re.search(r'[0-9]', password)
+
+def parse_amount(value):
+    """
+    Parse a money amount into a Decimal rounded to cents, of at most
+    12 integer digits
+    """
+    # Go through str so float inputs like 0.1 keep their written value
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError("Invalid amount")
+    
+    if isinstance(value, bool) or not amount.is_finite():
+        raise ValueError("Invalid amount")
+    
+    # quantize fails on values with more digits than the decimal context holds
+    try:
+        amount = amount.quantize(CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError("Invalid amount")
+    
+    if abs(amount) > MAX_AMOUNT:
+        raise ValueError("Invalid amount")
+    
+    return amount
+
+def parse_id(value):
+    """
+    Parse a row id from client input into an int
+
+    Booleans and floats with a fractional part are refused rather than
+    truncated, as int() would.
+    """
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError("Invalid id")
+    
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Invalid id")
+
+def parse_date(value):
+    """
+    Parse an ISO 8601 calendar date (YYYY-MM-DD)
+    """
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date, expected YYYY-MM-DD")
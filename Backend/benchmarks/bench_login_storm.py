@@ -0,0 +1,118 @@
+"""
+Measure how a login storm affects other requests' latency
+
+Usage:
+    python benchmarks/bench_login_storm.py [--storm-threads N] [--probe-threads N]
+        [--duration S] [--hash-workers N] [--method METHOD]
+
+Runs probe threads fetching a group while storm threads log in as fast as
+they can, in three phases: probes alone, a storm hashing passwords inline
+on the request threads (PASSWORD_HASH_WORKERS=0), and a storm hashing in a
+process pool (PASSWORD_HASH_WORKERS=--hash-workers). Reports login
+throughput and the probes' p50/p95/p99 for each phase.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+
+PASSWORD = 'storm-password'
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def run_phase(app, token, group_id, storm_threads, probe_threads, duration):
+    stop = threading.Event()
+    probes = []
+    logins = []
+    lock = threading.Lock()
+
+    def probe():
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get(f'/api/groups/{group_id}', headers=headers)
+            with lock:
+                probes.append(time.perf_counter() - start)
+
+    def storm(n):
+        client = app.test_client()
+        while not stop.is_set():
+            response = client.post('/api/auth/login', json={'email': f'storm{n}@example.com', 'password': PASSWORD})
+            assert response.status_code == 200, response.get_json()
+            with lock:
+                logins.append(1)
+
+    threads = [threading.Thread(target=probe) for _ in range(probe_threads)]
+    threads += [threading.Thread(target=storm, args=(n,)) for n in range(storm_threads)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return len(logins) / duration, probes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--storm-threads', type=int, default=8)
+    parser.add_argument('--probe-threads', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--hash-workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--method', default='scrypt:32768:8:1')
+    args = parser.parse_args()
+
+    scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+
+    class StormConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{scratch.name}'
+        PASSWORD_HASH_METHOD = args.method
+        PASSWORD_HASH_WORKERS = 0
+
+    try:
+        app = create_app(StormConfig)
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        for n in range(args.storm_threads):
+            client.post('/api/auth/register', json={
+                'username': f'storm{n}', 'email': f'storm{n}@example.com', 'password': PASSWORD
+            })
+        token = client.post('/api/auth/login', json={
+            'email': 'storm0@example.com', 'password': PASSWORD
+        }).get_json()['data']['token']
+        group = client.post('/api/groups', json={'name': 'probe', 'target_amount': 100},
+                            headers={'Authorization': f'Bearer {token}'}).get_json()['data']
+
+        print(f'method={args.method} storm_threads={args.storm_threads} '
+              f'probe_threads={args.probe_threads} duration={args.duration}s')
+        print(f"{'phase':<22} {'logins/s':>9} {'probes':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+        phases = (
+            ('no storm', 0, 0),
+            ('storm, inline', args.storm_threads, 0),
+            (f'storm, pool of {args.hash_workers}', args.storm_threads, args.hash_workers),
+        )
+        for name, storm_threads, workers in phases:
+            app.config['PASSWORD_HASH_WORKERS'] = workers
+            rate, probes = run_phase(app, token, group['id'], storm_threads, args.probe_threads, args.duration)
+            print(f'{name:<22} {rate:9.1f} {len(probes):>7} {percentile(probes, 50) * 1000:8.1f} '
+                  f'{percentile(probes, 95) * 1000:8.1f} {percentile(probes, 99) * 1000:8.1f}')
+    finally:
+        os.unlink(scratch.name)
+
+if __name__ == '__main__':
+    main()
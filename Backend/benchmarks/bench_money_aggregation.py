@@ -0,0 +1,80 @@
+"""
+Compare ledger aggregation speed for float and fixed-point money columns
+
+Usage:
+    python benchmarks/bench_money_aggregation.py [--rows N] [--groups N] [--database-uri URI]
+
+Creates two scratch tables holding the same synthetic ledger, one with a
+Float amount column (the old schema) and one with Numeric(14, 2) (the
+current schema), then times per-group SUM queries over each.
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+import sqlalchemy as sa
+
+def build_tables(metadata):
+    tables = {}
+    for name, amount_type in (('float', sa.Float()), ('numeric', sa.Numeric(14, 2))):
+        tables[name] = sa.Table(
+            f'bench_ledger_{name}', metadata,
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('group_id', sa.Integer, nullable=False, index=True),
+            sa.Column('amount', amount_type, nullable=False),
+        )
+    return tables
+
+def seed(engine, tables, rows, groups):
+    rng = random.Random(42)
+    cents = [rng.randint(1, 500_00) for _ in range(rows)]
+    group_ids = [rng.randint(1, groups) for _ in range(rows)]
+
+    with engine.begin() as conn:
+        conn.execute(tables['float'].insert(), [
+            {'group_id': g, 'amount': c / 100} for g, c in zip(group_ids, cents)
+        ])
+        conn.execute(tables['numeric'].insert(), [
+            {'group_id': g, 'amount': Decimal(c) / 100} for g, c in zip(group_ids, cents)
+        ])
+
+    return sum(cents)
+
+def time_sum(engine, table, repeat):
+    query = sa.select(table.c.group_id, sa.func.sum(table.c.amount)).group_by(table.c.group_id)
+    best = None
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            totals = conn.execute(query).all()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, sum(Decimal(str(total)) for _, total in totals)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database-uri', default='sqlite://')
+    args = parser.parse_args()
+
+    engine = sa.create_engine(args.database_uri)
+    metadata = sa.MetaData()
+    tables = build_tables(metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    try:
+        expected = Decimal(seed(engine, tables, args.rows, args.groups)) / 100
+        print(f'{args.rows} rows across {args.groups} groups, expected total {expected}')
+        for name, table in tables.items():
+            elapsed, total = time_sum(engine, table, args.repeat)
+            drift = total - expected
+            print(f'{name:>8}: best of {args.repeat} {elapsed * 1000:9.2f} ms  total {total}  drift {drift}')
+    finally:
+        metadata.drop_all(engine)
+
+if __name__ == '__main__':
+    main()
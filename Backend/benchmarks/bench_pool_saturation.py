@@ -0,0 +1,123 @@
+"""
+Show connection pool behavior as concurrency passes the pool's capacity
+
+Usage:
+    python benchmarks/bench_pool_saturation.py [--database-uri URI] [--pool-size N]
+        [--max-overflow N] [--pool-timeout S] [--hold-ms MS] [--concurrency 4,8,16,32]
+
+Each simulated request checks a connection out of the app's engine, runs a
+query and holds the connection for --hold-ms, like a request doing a slow
+read. For each concurrency level it reports throughput, latency percentiles,
+pool timeouts and the time requests spent waiting for a connection. Once
+concurrency exceeds pool_size + max_overflow, requests queue for
+connections, and past pool_timeout they fail instead of hanging.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.utils.pool import InstrumentedQueuePool, pool_stats
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def run_level(engine, concurrency, requests_per_worker, hold):
+    latencies = []
+    timeouts = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal timeouts
+        for _ in range(requests_per_worker):
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(db.text('SELECT 1'))
+                    time.sleep(hold)
+            except PoolTimeoutError:
+                with lock:
+                    timeouts += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    engine.pool.reset_stats()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'mean': statistics.fmean(latencies) if latencies else 0.0,
+        'timeouts': timeouts,
+        'pool': pool_stats(engine)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database-uri')
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--max-overflow', type=int, default=5)
+    parser.add_argument('--pool-timeout', type=float, default=1.0)
+    parser.add_argument('--hold-ms', type=float, default=50)
+    parser.add_argument('--requests', type=int, default=20, help='requests per worker')
+    parser.add_argument('--concurrency', default='4,8,16,32')
+    args = parser.parse_args()
+
+    scratch = None
+    uri = args.database_uri
+    if uri is None:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        uri = f'sqlite:///{scratch.name}'
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': args.pool_size,
+            'max_overflow': args.max_overflow,
+            'pool_timeout': args.pool_timeout,
+            'pool_pre_ping': True
+        }
+
+    app = create_app(BenchConfig)
+    capacity = args.pool_size + args.max_overflow
+    print(f'pool_size={args.pool_size} max_overflow={args.max_overflow} '
+          f'timeout={args.pool_timeout}s hold={args.hold_ms}ms capacity={capacity}')
+    print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'wait avg':>9} {'wait max':>9} {'timeouts':>9}")
+
+    try:
+        with app.app_context():
+            for concurrency in (int(c) for c in args.concurrency.split(',')):
+                r = run_level(db.engine, concurrency, args.requests, args.hold_ms / 1000)
+                print(f"{concurrency:>8} {r['throughput']:8.1f} {r['p50'] * 1000:8.1f} "
+                      f"{r['p95'] * 1000:8.1f} {r['p99'] * 1000:8.1f} "
+                      f"{r['pool']['wait_avg_ms']:9.1f} {r['pool']['wait_max_ms']:9.1f} {r['timeouts']:>9}")
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare API serialization paths for transaction lists
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 1000,10000,100000] [--repeat N]
+
+Seeds an in-memory SQLite database with one group's transactions and times
+turning them into a JSON response body three ways: loading ORM objects and
+calling to_dict (the original path, encoded by Flask's default provider),
+the column projection with the standard-library fallback provider, and the
+column projection with orjson.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Group, Membership, Transaction, User
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+from app.utils.serializers import transaction_row
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+def seed(count):
+    db.session.execute(db.delete(Transaction))
+    db.session.execute(db.delete(Membership))
+    db.session.execute(db.delete(Group))
+    db.session.execute(db.delete(User))
+
+    users = [{'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'} for i in range(1, 51)]
+    db.session.execute(db.insert(User), users)
+    db.session.execute(db.insert(Group), [{'id': 1, 'name': 'bench', 'created_by': 1}])
+
+    start = datetime(2024, 1, 1)
+    db.session.execute(db.insert(Transaction), [{
+        'user_id': i % 50 + 1, 'group_id': 1, 'amount': Decimal(i % 10000) / 100,
+        'type': 'deposit', 'status': 'approved', 'description': 'monthly contribution',
+        'created_at': start + timedelta(seconds=i)
+    } for i in range(count)])
+    db.session.commit()
+
+def orm_page():
+    transactions = Transaction.query.options(
+        db.joinedload(Transaction.user).load_only(User.username)
+    ).filter_by(group_id=1).order_by(Transaction.created_at.desc(), Transaction.id.desc()).all()
+    return [t.to_dict() for t in transactions]
+
+def projected_page():
+    rows = db.session.query(*transaction_row.columns).outerjoin(
+        User, User.id == Transaction.user_id
+    ).filter(Transaction.group_id == 1).order_by(Transaction.created_at.desc(), Transaction.id.desc())
+    return [transaction_row(row) for row in rows]
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(BenchConfig)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    orjson = json_provider.orjson
+
+    with app.app_context():
+        db.create_all()
+
+        print(f"{'rows':>8} {'orm+to_dict':>14} {'rows+stdlib':>14} {'rows+orjson':>14}")
+        for size in (int(s) for s in args.sizes.split(',')):
+            seed(size)
+
+            orm = best_of(args.repeat, lambda: default_provider.dumps(orm_page()))
+
+            json_provider.orjson = None
+            stdlib = best_of(args.repeat, lambda: fast_provider.dumps(projected_page()))
+            json_provider.orjson = orjson
+
+            fast = 'n/a'
+            if orjson is not None:
+                fast = f"{best_of(args.repeat, lambda: fast_provider.dumps(projected_page())) * 1000:11.1f} ms"
+
+            print(f'{size:>8} {orm * 1000:11.1f} ms {stdlib * 1000:11.1f} ms {fast:>14}')
+
+if __name__ == '__main__':
+    main()
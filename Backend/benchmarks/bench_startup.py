@@ -0,0 +1,82 @@
+"""
+Measure a cold start: importing the app package and running create_app()
+
+Usage:
+    python benchmarks/bench_startup.py [--database-uri URI] [--runs N] [--create-all]
+
+Each run is a fresh interpreter, so nothing is cached between runs except
+bytecode and the OS file cache (one untimed warm-up run fills both). Reports
+the median and minimum of the import, create_app() and, with --create-all,
+a db.create_all() against the already-created schema, which is what every
+process used to do on boot.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+from app import create_app
+from app.extensions import db
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+timings = {'import': imported - start, 'create_app': created - imported}
+if sys.argv[2] == '1':
+    with app.app_context():
+        db.create_all()
+    timings['create_all'] = time.perf_counter() - created
+print(json.dumps(timings))
+"""
+
+def run(uri, create_all):
+    env = dict(os.environ, DATABASE_URI=uri)
+    child = subprocess.run(
+        [sys.executable, '-c', CHILD, BACKEND, '1' if create_all else '0'],
+        env=env, capture_output=True, text=True
+    )
+    if child.returncode:
+        sys.exit(child.stderr)
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database-uri')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--create-all', action='store_true',
+                        help='also time create_all() on boot, as the app used to')
+    args = parser.parse_args()
+
+    scratch = None
+    uri = args.database_uri
+    if uri is None:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        uri = f'sqlite:///{scratch.name}'
+
+    try:
+        # Creates the schema in a scratch database and warms the caches
+        run(uri, True)
+        runs = [run(uri, args.create_all) for _ in range(args.runs)]
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+    print(f'runs={args.runs} database={uri.split(":", 1)[0]}')
+    print(f"{'phase':<12} {'median ms':>10} {'min ms':>8}")
+    phases = list(runs[0]) + ['total']
+    for run_timings in runs:
+        run_timings['total'] = sum(run_timings.values())
+    for phase in phases:
+        values = [r[phase] for r in runs]
+        print(f'{phase:<12} {statistics.median(values) * 1000:10.1f} {min(values) * 1000:8.1f}')
+
+if __name__ == '__main__':
+    main()
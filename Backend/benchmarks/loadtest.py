@@ -0,0 +1,325 @@
+"""
+Load-test the API end to end against a seeded synthetic dataset
+
+Usage:
+    python benchmarks/loadtest.py [--database-uri URI] [--users N] [--groups N]
+        [--members-per-group N] [--transactions N] [--workers N] [--requests N]
+        [--output results.json] [--baseline results.json --tolerance 0.25]
+
+Seeds users, groups, memberships and transactions (into a scratch SQLite
+file unless --database-uri points at e.g. a local Postgres), then runs
+--workers concurrent sessions against the real Flask app. Each session logs
+in and issues --requests weighted-random calls: contribute, withdraw, list
+transactions, list groups, dashboard, plus fresh register/login calls.
+Runs are reproducible for a given --seed.
+
+Prints throughput, error counts and p50/p95/p99 latency per endpoint. With
+--baseline, exits 1 if any endpoint's p95 grew, or overall throughput fell,
+by more than --tolerance compared with a previous --output file.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Group, LedgerEntry, Membership, Transaction, User
+from app.services.summary_service import rebuild_summaries
+
+PASSWORD = 'loadtest-password'
+CHUNK = 50_000
+
+# Relative frequency of each call in a session
+FLOWS = {
+    'contribute': 30,
+    'list_transactions': 25,
+    'list_groups': 15,
+    'withdraw': 10,
+    'dashboard': 10,
+    'login': 5,
+    'register': 5,
+}
+
+def seed(args):
+    """
+    Fill an empty database with the synthetic dataset
+
+    Returns {user_id: [group_id, ...]} for the users that belong to a group
+    """
+    rng = random.Random(args.seed)
+    password_hash = generate_password_hash(PASSWORD)
+    now = datetime.utcnow()
+
+    _insert_chunked(User, ({
+        'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com',
+        'password_hash': password_hash, 'created_at': now
+    } for i in range(1, args.users + 1)))
+
+    members = {}
+    memberships = []
+    for group_id in range(1, args.groups + 1):
+        creator = (group_id - 1) % args.users + 1
+        others = rng.sample(range(1, args.users + 1), min(args.members_per_group, args.users))
+        group_members = [creator] + [u for u in others if u != creator][:args.members_per_group - 1]
+        members[group_id] = group_members
+        memberships += [
+            {'user_id': u, 'group_id': group_id, 'is_admin': u == creator, 'joined_at': now}
+            for u in group_members
+        ]
+
+    balances = {group_id: 0 for group_id in members}
+
+    def transactions():
+        start = now - timedelta(days=365)
+        step = timedelta(days=365) / max(args.transactions, 1)
+        for i in range(args.transactions):
+            group_id = rng.randint(1, args.groups)
+            cents = rng.randint(100, 50_000)
+            roll = rng.random()
+
+            if roll < 0.9 or balances[group_id] < cents:
+                kind, status = 'deposit', 'approved'
+                balances[group_id] += cents
+            elif roll < 0.97:
+                kind, status = 'withdrawal', 'approved'
+                balances[group_id] -= cents
+            else:
+                kind, status = 'withdrawal', 'pending'
+
+            yield {
+                'user_id': rng.choice(members[group_id]), 'group_id': group_id,
+                'amount': Decimal(cents) / 100, 'type': kind, 'status': status,
+                'description': 'seeded', 'created_at': start + step * i
+            }
+
+    _insert_chunked(Group, ({
+        'id': group_id, 'name': f'group{group_id}', 'description': 'seeded',
+        'target_amount': Decimal(1_000_000), 'current_amount': 0,
+        'created_by': group_members[0], 'created_at': now
+    } for group_id, group_members in members.items()))
+    _insert_chunked(Membership, iter(memberships))
+    _insert_chunked(Transaction, transactions())
+
+    # The ledger holds every settled transaction, signed
+    db.session.execute(db.insert(LedgerEntry).from_select(
+        ['group_id', 'transaction_id', 'amount', 'created_at'],
+        db.select(
+            Transaction.group_id, Transaction.id,
+            db.case((Transaction.type == 'deposit', Transaction.amount), else_=-Transaction.amount),
+            Transaction.created_at
+        ).where(Transaction.status == 'approved').order_by(Transaction.created_at, Transaction.id)
+    ))
+
+    # Balances are only final once every transaction has been generated
+    db.session.execute(db.update(Group), [
+        {'id': group_id, 'current_amount': Decimal(cents) / 100} for group_id, cents in balances.items()
+    ])
+    # Explicit ids leave Postgres sequences behind; move them past the seeded rows
+    if db.engine.dialect.name == 'postgresql':
+        for table in ('users', 'groups'):
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+
+    db.session.commit()
+    rebuild_summaries()
+
+    return _groups_by_user()
+
+def _insert_chunked(model, rows):
+    while True:
+        chunk = [row for _, row in zip(range(CHUNK), rows)]
+        if not chunk:
+            return
+        db.session.execute(db.insert(model), chunk)
+
+def _groups_by_user():
+    groups = {}
+    for user_id, group_id in db.session.query(Membership.user_id, Membership.group_id):
+        groups.setdefault(user_id, []).append(group_id)
+    return groups
+
+class Recorder:
+    """
+    Collects per-endpoint latencies and error counts from all workers
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def call(self, endpoint, fn):
+        start = time.perf_counter()
+        response = fn()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        return response
+
+def session(app, recorder, groups_by_user, worker_id, args):
+    rng = random.Random(f'{args.seed}:{worker_id}')
+    client = app.test_client()
+    user_ids = sorted(groups_by_user)
+    flows, weights = zip(*FLOWS.items())
+
+    def login(user_id):
+        response = recorder.call('login', lambda: client.post('/api/auth/login', json={
+            'email': f'user{user_id}@example.com', 'password': PASSWORD
+        }))
+        return {'Authorization': f"Bearer {response.get_json()['data']['token']}"}
+
+    user_id = rng.choice(user_ids)
+    headers = login(user_id)
+
+    for n in range(args.requests):
+        flow = rng.choices(flows, weights)[0]
+        group_id = rng.choice(groups_by_user[user_id])
+
+        if flow == 'contribute':
+            recorder.call(flow, lambda: client.post('/api/transactions', headers=headers, json={
+                'group_id': group_id, 'amount': rng.randint(100, 10_000) / 100
+            }))
+        elif flow == 'withdraw':
+            recorder.call(flow, lambda: client.post('/api/withdrawals', headers=headers, json={
+                'group_id': group_id, 'amount': rng.randint(100, 5_000) / 100
+            }))
+        elif flow == 'list_transactions':
+            recorder.call(flow, lambda: client.get(f'/api/groups/{group_id}/transactions', headers=headers))
+        elif flow == 'list_groups':
+            recorder.call(flow, lambda: client.get('/api/groups', headers=headers))
+        elif flow == 'dashboard':
+            recorder.call(flow, lambda: client.get('/api/users/me/dashboard', headers=headers))
+        elif flow == 'login':
+            user_id = rng.choice(user_ids)
+            headers = login(user_id)
+        elif flow == 'register':
+            name = f'load{args.seed}w{worker_id}n{n}'
+            recorder.call(flow, lambda: client.post('/api/auth/register', json={
+                'username': name, 'email': f'{name}@example.com', 'password': PASSWORD
+            }))
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def summarize(recorder, elapsed):
+    results = {'elapsed_s': round(elapsed, 3), 'endpoints': {}}
+    total = 0
+    for endpoint, samples in sorted(recorder.samples.items()):
+        samples.sort()
+        total += len(samples)
+        results['endpoints'][endpoint] = {
+            'requests': len(samples),
+            'errors': recorder.errors.get(endpoint, 0),
+            'throughput': round(len(samples) / elapsed, 2),
+            'p50_ms': round(percentile(samples, 50) * 1000, 2),
+            'p95_ms': round(percentile(samples, 95) * 1000, 2),
+            'p99_ms': round(percentile(samples, 99) * 1000, 2),
+        }
+    results['throughput'] = round(total / elapsed, 2)
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    List regressions of results against a baseline run
+    """
+    regressions = []
+    for endpoint, stats in results['endpoints'].items():
+        before = baseline['endpoints'].get(endpoint)
+        if before and stats['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']} -> {stats['p95_ms']} ms")
+    if results['throughput'] < baseline['throughput'] * (1 - tolerance):
+        regressions.append(f"throughput {baseline['throughput']} -> {results['throughput']} req/s")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database-uri')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--members-per-group', type=int, default=20)
+    parser.add_argument('--transactions', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='requests per worker')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-seed', action='store_true', help='reuse data already in --database-uri')
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    scratch = None
+    uri = args.database_uri
+    if uri is None:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        uri = f'sqlite:///{scratch.name}'
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+
+    try:
+        app = create_app(LoadTestConfig)
+        with app.app_context():
+            if args.skip_seed:
+                groups_by_user = _groups_by_user()
+            else:
+                # A scratch database starts empty; a migrated one is left as is
+                db.create_all()
+                # Bulk seeding inserts are slow by design; keep them out of the slow query log
+                slow_query_ms, app.config['SLOW_QUERY_MS'] = app.config['SLOW_QUERY_MS'], 0
+                start = time.perf_counter()
+                groups_by_user = seed(args)
+                app.config['SLOW_QUERY_MS'] = slow_query_ms
+                print(f'Seeded {args.users} users, {args.groups} groups and '
+                      f'{args.transactions} transactions in {time.perf_counter() - start:.1f}s')
+
+        recorder = Recorder()
+        workers = [
+            threading.Thread(target=session, args=(app, recorder, groups_by_user, i, args))
+            for i in range(args.workers)
+        ]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        results = summarize(recorder, time.perf_counter() - start)
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+    print(f"{'endpoint':<18} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, s in results['endpoints'].items():
+        print(f"{endpoint:<18} {s['requests']:>8} {s['errors']:>7} {s['throughput']:8.1f} "
+              f"{s['p50_ms']:8.1f} {s['p95_ms']:8.1f} {s['p99_ms']:8.1f}")
+    print(f"{'total':<18} {'':>8} {'':>7} {results['throughput']:8.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
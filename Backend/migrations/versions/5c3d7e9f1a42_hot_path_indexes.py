@@ -0,0 +1,36 @@
+"""hot path indexes
+
+Revision ID: 5c3d7e9f1a42
+Revises: 1a2f4c6e8b01
+Create Date: 2026-10-18 09:40:17.218845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c3d7e9f1a42'
+down_revision = '1a2f4c6e8b01'
+branch_labels = None
+depends_on = None
+
+PENDING_WITHDRAWAL = sa.text("type = 'withdrawal' AND status = 'pending'")
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_group_id_created_at', ['group_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+        batch_op.create_index('ix_transactions_pending_withdrawals', ['group_id', 'created_at'], unique=False, postgresql_where=PENDING_WITHDRAWAL, sqlite_where=PENDING_WITHDRAWAL)
+
+    with op.batch_alter_table('memberships', schema=None) as batch_op:
+        batch_op.create_index('ix_memberships_group_id_is_admin', ['group_id', 'is_admin'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('memberships', schema=None) as batch_op:
+        batch_op.drop_index('ix_memberships_group_id_is_admin')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_pending_withdrawals')
+        batch_op.drop_index('ix_transactions_group_id_created_at')
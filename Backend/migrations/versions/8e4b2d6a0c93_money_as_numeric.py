@@ -0,0 +1,45 @@
+"""store money as numeric
+
+Revision ID: 8e4b2d6a0c93
+Revises: 5c3d7e9f1a42
+Create Date: 2026-10-18 11:05:52.640193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2d6a0c93'
+down_revision = '5c3d7e9f1a42'
+branch_labels = None
+depends_on = None
+
+MONEY = sa.Numeric(precision=14, scale=2)
+
+
+def upgrade():
+    # Existing float values are rounded to the nearest cent
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.alter_column('target_amount', existing_type=sa.Float(), type_=MONEY, existing_nullable=True,
+                              postgresql_using='round(target_amount::numeric, 2)')
+        batch_op.alter_column('current_amount', existing_type=sa.Float(), type_=MONEY, existing_nullable=True,
+                              postgresql_using='round(current_amount::numeric, 2)')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), type_=MONEY, existing_nullable=False,
+                              postgresql_using='round(amount::numeric, 2)')
+
+    # SQLite keeps the stored values when only the declared type changes
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('UPDATE groups SET target_amount = round(target_amount, 2), current_amount = round(current_amount, 2)')
+        op.execute('UPDATE transactions SET amount = round(amount, 2)')
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('amount', existing_type=MONEY, type_=sa.Float(), existing_nullable=False)
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.alter_column('current_amount', existing_type=MONEY, type_=sa.Float(), existing_nullable=True)
+        batch_op.alter_column('target_amount', existing_type=MONEY, type_=sa.Float(), existing_nullable=True)
@@ -0,0 +1,49 @@
+"""member summaries
+
+Revision ID: b7f0c3e5a1d4
+Revises: 8e4b2d6a0c93
+Create Date: 2026-10-18 13:27:06.912354
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f0c3e5a1d4'
+down_revision = '8e4b2d6a0c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('member_summaries',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_deposited', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_withdrawn', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('pending_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('pending_count', sa.Integer(), nullable=False),
+    sa.Column('last_activity_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+
+    # Backfill from the existing ledger
+    op.execute("""
+        INSERT INTO member_summaries (group_id, user_id, total_deposited, total_withdrawn,
+                                      pending_amount, pending_count, last_activity_at)
+        SELECT group_id, user_id,
+               SUM(CASE WHEN type = 'deposit' THEN amount ELSE 0 END),
+               SUM(CASE WHEN type = 'withdrawal' AND status = 'approved' THEN amount ELSE 0 END),
+               SUM(CASE WHEN type = 'withdrawal' AND status = 'pending' THEN amount ELSE 0 END),
+               SUM(CASE WHEN type = 'withdrawal' AND status = 'pending' THEN 1 ELSE 0 END),
+               MAX(created_at)
+        FROM transactions
+        GROUP BY group_id, user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('member_summaries')
@@ -0,0 +1,25 @@
+"""case insensitive email
+
+Revision ID: c2a9e4f7b318
+Revises: b7f0c3e5a1d4
+Create Date: 2026-10-18 19:02:44.530127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2a9e4f7b318'
+down_revision = 'b7f0c3e5a1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fails if existing emails differ only by case; merge those accounts first
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
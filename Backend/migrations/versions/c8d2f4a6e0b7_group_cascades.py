@@ -0,0 +1,45 @@
+"""group cascades
+
+Revision ID: c8d2f4a6e0b7
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-18 19:49:02.551531
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d2f4a6e0b7'
+down_revision = 'a3c5e7f9b1d4'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL's names for the unnamed foreign keys; SQLite's reflected,
+# nameless ones get the same names in batch mode
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+# (table, column, referred table, ondelete before, ondelete after)
+FOREIGN_KEYS = [
+    ('ledger_entries', 'transaction_id', 'transactions', 'CASCADE', 'SET NULL'),
+    ('member_summaries', 'group_id', 'groups', None, 'CASCADE'),
+    ('memberships', 'group_id', 'groups', None, 'CASCADE'),
+    ('transactions', 'group_id', 'groups', None, 'CASCADE'),
+]
+
+
+def _replace_foreign_key(table, column, referred, ondelete):
+    name = f'{table}_{column}_fkey'
+    with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    for table, column, referred, _, ondelete in FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referred, ondelete)
+
+
+def downgrade():
+    for table, column, referred, ondelete, _ in reversed(FOREIGN_KEYS):
+        _replace_foreign_key(table, column, referred, ondelete)
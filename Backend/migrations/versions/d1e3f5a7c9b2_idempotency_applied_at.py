@@ -0,0 +1,26 @@
+"""idempotency applied_at
+
+Revision ID: d1e3f5a7c9b2
+Revises: c8d2f4a6e0b7
+Create Date: 2026-10-18 19:52:18.017325
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1e3f5a7c9b2'
+down_revision = 'c8d2f4a6e0b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('applied_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_column('applied_at')
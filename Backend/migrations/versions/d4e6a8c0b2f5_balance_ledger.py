@@ -0,0 +1,66 @@
+"""balance ledger
+
+Revision ID: d4e6a8c0b2f5
+Revises: c2a9e4f7b318
+Create Date: 2026-10-18 19:31:08.642210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e6a8c0b2f5'
+down_revision = 'c2a9e4f7b318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ledger_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ledger_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_ledger_entries_group_id_id', ['group_id', 'id'], unique=False)
+
+    op.create_table('balance_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('last_entry_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('as_of', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('balance_snapshots', schema=None) as batch_op:
+        batch_op.create_index('ix_balance_snapshots_group_id_as_of', ['group_id', 'as_of'], unique=False)
+
+    # Backfill the ledger from the settled transactions, in time order
+    op.execute("""
+        INSERT INTO ledger_entries (group_id, transaction_id, amount, created_at)
+        SELECT group_id, id,
+               CASE WHEN type = 'deposit' THEN amount ELSE -amount END,
+               created_at
+        FROM transactions
+        WHERE status = 'approved'
+        ORDER BY created_at, id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('balance_snapshots', schema=None) as batch_op:
+        batch_op.drop_index('ix_balance_snapshots_group_id_as_of')
+
+    op.drop_table('balance_snapshots')
+    with op.batch_alter_table('ledger_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_ledger_entries_group_id_id')
+
+    op.drop_table('ledger_entries')
@@ -0,0 +1,40 @@
+"""contribution rollups
+
+Revision ID: e7b9d1f3a5c6
+Revises: d4e6a8c0b2f5
+Create Date: 2026-10-18 20:04:51.117384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b9d1f3a5c6'
+down_revision = 'd4e6a8c0b2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('contribution_rollups',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'day', 'user_id', 'type')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('rolled_up_until', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id')
+    )
+
+
+def downgrade():
+    op.drop_table('rollup_watermarks')
+    op.drop_table('contribution_rollups')
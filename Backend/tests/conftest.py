@@ -0,0 +1,50 @@
+import os
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.config import Config
+from app.extensions import db
+
+@pytest.fixture
+def config():
+    """
+    Settings to override for the app; test modules redefine this fixture
+    """
+    return {}
+
+@pytest.fixture
+def app(tmp_path, config):
+    """
+    App on a scratch SQLite file, or on TEST_DATABASE_URI (e.g. a local
+    Postgres database, whose tables are dropped afterwards)
+    """
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+        TESTING = True
+
+    for name, value in config.items():
+        setattr(TestConfig, name, value)
+
+    # Only the default bind holds tables; db keeps the metadata of binds
+    # (such as the replica) that earlier apps configured
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+@pytest.fixture
+def statements(app):
+    """
+    List of the SQL statements run on the engine while the test runs
+    """
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield seen
+    event.remove(db.engine, 'before_cursor_execute', record)
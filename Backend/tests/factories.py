@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models import Group, Membership, Transaction, User
+
+def add_users(count, prefix='user'):
+    """
+    Insert count users with a placeholder password hash; returns their ids
+    """
+    db.session.execute(db.insert(User), [
+        {'username': f'{prefix}{i}', 'email': f'{prefix}{i}@example.com', 'password_hash': 'x'}
+        for i in range(count)
+    ])
+    db.session.commit()
+    return db.session.scalars(
+        db.select(User.id).where(User.username.like(f'{prefix}%')).order_by(User.id)
+    ).all()
+
+def add_group(admin_id, member_ids=(), name='Group'):
+    """
+    Create a group administered by admin_id with the given other members
+    """
+    group = Group(name=name, target_amount=0, current_amount=0, created_by=admin_id)
+    db.session.add(group)
+    db.session.flush()
+    db.session.add(Membership(user_id=admin_id, group_id=group.id, is_admin=True))
+    db.session.add_all(Membership(user_id=user_id, group_id=group.id) for user_id in member_ids)
+    db.session.commit()
+    return group.id
+
+def add_transactions(group_id, user_ids, count, type='deposit', status='approved'):
+    """
+    Insert count transactions spread over user_ids, a minute apart
+    """
+    start = datetime.utcnow() - timedelta(minutes=count)
+    db.session.execute(db.insert(Transaction), [
+        {
+            'user_id': user_ids[i % len(user_ids)],
+            'group_id': group_id,
+            'amount': 10,
+            'type': type,
+            'status': status,
+            'created_at': start + timedelta(minutes=i)
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def auth_headers(user_id):
+    """
+    Authorization header with an access token for user_id
+    """
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
@@ -0,0 +1,61 @@
+from decimal import Decimal
+import pytest
+from app.extensions import db
+from app.models import Group, LedgerEntry, Transaction
+from app.utils.validators import MAX_AMOUNT, parse_amount
+from tests.factories import add_users, add_group, auth_headers
+
+@pytest.mark.parametrize('value', ['1e30', '1e12', '-1e12', '1' * 40, '999999999999.995', 'nan', 'x', True])
+def test_parse_amount_rejects_invalid_and_oversized_amounts(value):
+    with pytest.raises(ValueError, match='Invalid amount'):
+        parse_amount(value)
+
+def test_parse_amount_accepts_the_largest_amount():
+    assert parse_amount('999999999999.99') == MAX_AMOUNT
+    assert parse_amount(0.1) == Decimal('0.10')
+
+def test_oversized_amounts_are_rejected_per_request_and_per_item(app):
+    user_ids = add_users(1)
+    group_id = add_group(user_ids[0])
+    client = app.test_client()
+    headers = auth_headers(user_ids[0])
+
+    response = client.post('/api/transactions', json={'group_id': group_id, 'amount': '1e30'}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/groups', json={'name': 'Big', 'target_amount': '1e30'}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/transactions/batch', json=[
+        {'group_id': group_id, 'amount': '1e30'},
+        {'group_id': group_id, 'amount': '5.00'},
+    ], headers=headers)
+    results = response.get_json()['data']['results']
+    assert response.status_code == 200
+    assert [result['status'] for result in results] == ['error', 'created']
+
+def test_credits_never_take_a_balance_over_the_maximum(app):
+    user_ids = add_users(1)
+    group_id = add_group(user_ids[0])
+    other_group_id = add_group(user_ids[0], name='Other')
+    db.session.execute(db.update(Group).where(Group.id == group_id).values(current_amount=MAX_AMOUNT - 10))
+    db.session.commit()
+    client = app.test_client()
+    headers = auth_headers(user_ids[0])
+
+    response = client.post('/api/transactions', json={'group_id': group_id, 'amount': '10.01'}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/transactions/batch', json=[
+        {'group_id': group_id, 'amount': '6.00'},
+        {'group_id': other_group_id, 'amount': '6.00'},
+        {'group_id': group_id, 'amount': '6.00'},
+    ], headers=headers)
+    results = response.get_json()['data']['results']
+    assert [result['status'] for result in results] == ['error', 'created', 'error']
+
+    db.session.expire_all()
+    assert db.session.get(Group, group_id).current_amount == MAX_AMOUNT - 10
+    assert db.session.get(Group, other_group_id).current_amount == Decimal('6.00')
+    assert db.session.scalar(db.select(db.func.count()).select_from(Transaction)) == 1
+    assert db.session.scalar(db.select(db.func.count()).select_from(LedgerEntry)) == 1
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models import ContributionRollup, LedgerEntry, RollupWatermark, Transaction
+from app.services.transaction_service import create_contribution, request_withdrawal, update_withdrawal_status
+from tests.factories import add_users, add_group, auth_headers
+
+def backdate(transaction_id, days):
+    created_at = datetime.utcnow() - timedelta(days=days)
+    db.session.execute(db.update(Transaction).where(Transaction.id == transaction_id).values(created_at=created_at))
+    db.session.execute(db.update(LedgerEntry).where(LedgerEntry.transaction_id == transaction_id).values(created_at=created_at))
+    db.session.commit()
+
+def test_analytics_read_rollups_and_the_open_tail_without_writing(app, statements):
+    admin_id, member_id = add_users(2)
+    group_id = add_group(admin_id, [member_id])
+    backdate(create_contribution(member_id, group_id, '30.00').id, days=3)
+    backdate(create_contribution(admin_id, group_id, '20.00').id, days=3)
+    withdrawal = request_withdrawal(member_id, group_id, '15.00')
+    update_withdrawal_status(withdrawal.id, admin_id, 'approved')
+    create_contribution(member_id, group_id, '5.00')
+    client = app.test_client()
+
+    def analytics():
+        statements.clear()
+        response = client.get(f'/api/groups/{group_id}/analytics', headers=auth_headers(admin_id))
+        assert response.status_code == 200
+        assert not [s for s in statements if not s.startswith('SELECT')]
+        return response.get_json()['data']['columns']
+
+    today = datetime.utcnow().date()
+    expected = {
+        'period': [(today - timedelta(days=3)).isoformat(), today.isoformat(), today.isoformat()],
+        'type': ['deposit', 'deposit', 'withdrawal'],
+        'total': [50.0, 5.0, 15.0],
+        'count': [2, 1, 1],
+    }
+    assert analytics() == expected
+    assert db.session.scalar(db.select(db.func.count()).select_from(ContributionRollup)) == 0
+
+    result = app.test_cli_runner().invoke(args=['analytics', 'rollup'])
+    assert result.exit_code == 0 and 'Rolled up 1 groups' in result.output
+
+    assert db.session.scalar(db.select(RollupWatermark.rolled_up_until)) <= today
+    assert db.session.scalar(db.select(db.func.sum(ContributionRollup.count))) == 2
+    assert analytics() == expected
+
+    # Closed days are only rolled up once
+    assert 'Rolled up 0 groups' in app.test_cli_runner().invoke(args=['analytics', 'rollup']).output
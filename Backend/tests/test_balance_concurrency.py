@@ -0,0 +1,90 @@
+import threading
+from decimal import Decimal
+from app.extensions import db
+from app.models import Group, LedgerEntry, Transaction
+from app.services.transaction_service import create_contribution, request_withdrawal, update_withdrawal_status
+from tests.factories import add_users, add_group
+
+THREADS = 8
+DEPOSITS_PER_THREAD = 25
+
+def run_concurrently(app, jobs):
+    """
+    Run each job in its own thread and app context at the same time
+
+    Returns the messages of the ValueErrors the jobs raised; any other
+    exception fails the test
+    """
+    start = threading.Barrier(len(jobs))
+    refused, errors = [], []
+
+    def run(job):
+        with app.app_context():
+            start.wait()
+            try:
+                job()
+            except ValueError as e:
+                refused.append(str(e))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    return refused
+
+def test_concurrent_deposits_and_decisions_keep_balance_equal_to_ledger(app):
+    user_ids = add_users(THREADS)
+    admin_id = user_ids[0]
+    group_id = add_group(admin_id, user_ids[1:])
+
+    create_contribution(admin_id, group_id, '100.00')
+    withdrawal_ids = [
+        request_withdrawal(user_id, group_id, '30.00').id
+        for user_id in user_ids
+    ]
+    db.session.remove()
+
+    def deposit(user_id):
+        def job():
+            for _ in range(DEPOSITS_PER_THREAD):
+                create_contribution(user_id, group_id, '1.25')
+        return job
+
+    def approve(transaction_id):
+        return lambda: update_withdrawal_status(transaction_id, admin_id, 'approved')
+
+    # Every withdrawal is decided by two racing threads; only one may win
+    jobs = [deposit(user_id) for user_id in user_ids]
+    jobs += [approve(transaction_id) for transaction_id in withdrawal_ids] * 2
+    refused = run_concurrently(app, jobs)
+
+    assert set(refused) <= {
+        "This withdrawal has already been processed",
+        "The group doesn't have enough funds for this withdrawal",
+    }
+
+    balance = db.session.get(Group, group_id).current_amount
+    ledger = db.session.scalar(db.select(db.func.sum(LedgerEntry.amount)).where(LedgerEntry.group_id == group_id))
+    approved_withdrawals = db.session.scalar(
+        db.select(db.func.count()).where(
+            Transaction.id.in_(withdrawal_ids), Transaction.status == 'approved'
+        )
+    )
+
+    payouts = db.session.execute(
+        db.select(db.func.count(), db.func.count(LedgerEntry.transaction_id.distinct()))
+        .where(LedgerEntry.group_id == group_id, LedgerEntry.amount < 0)
+    ).one()
+
+    assert balance == ledger
+    # Each approved withdrawal was paid out exactly once
+    assert tuple(payouts) == (approved_withdrawals, approved_withdrawals)
+    assert balance == Decimal('100.00') + THREADS * DEPOSITS_PER_THREAD * Decimal('1.25') - approved_withdrawals * Decimal('30.00')
+    assert balance >= 0
@@ -0,0 +1,23 @@
+from app.utils.cache import CacheBackend, LocalCacheBackend, make_backend
+
+class RecordingBackend(LocalCacheBackend):
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+def test_make_backend_builds_the_named_backend(app):
+    local = make_backend(app, 'local', size=2, ttl=60)
+    assert isinstance(local, LocalCacheBackend)
+    for key in 'abc':
+        local.set(key, True)
+    assert local.get('a') is None and local.get('c') is True
+
+    imported = make_backend(app, f'{__name__}.RecordingBackend', size=2, ttl=60)
+    assert isinstance(imported, CacheBackend) and imported.app is app
+
+    assert make_backend(app, '', size=2, ttl=60) is None
+
+def test_app_stores_use_their_settings(app):
+    assert isinstance(app.extensions['token_store'], LocalCacheBackend)
+    assert app.extensions['response_cache'] is None
+    assert app.extensions['replica_sticky'] is None
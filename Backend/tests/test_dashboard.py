@@ -0,0 +1,29 @@
+from app.extensions import db
+from app.models import Group, Membership
+from app.services.group_service import get_user_dashboard
+from tests.factories import add_users, add_transactions
+
+def test_dashboard_for_a_member_of_many_groups(app):
+    user_id = add_users(1)[0]
+    db.session.execute(db.insert(Group), [
+        {'name': f'Group {i}', 'target_amount': 0, 'current_amount': 0, 'created_by': user_id}
+        for i in range(600)
+    ])
+    group_ids = db.session.scalars(db.select(Group.id).order_by(Group.id)).all()
+    db.session.execute(db.insert(Membership), [
+        {'user_id': user_id, 'group_id': group_id, 'is_admin': True} for group_id in group_ids
+    ])
+    db.session.commit()
+    for group_id in group_ids[::50]:
+        add_transactions(group_id, [user_id], 3)
+
+    dashboard = get_user_dashboard(user_id, recent_limit=2)
+
+    assert [group['id'] for group in dashboard] == group_ids
+    for group in dashboard:
+        recent = group['recent_transactions']
+        if group['id'] in group_ids[::50]:
+            assert len(recent) == 2
+            assert recent[0]['created_at'] > recent[1]['created_at']
+        else:
+            assert recent == []
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models import IdempotencyKey, LedgerEntry, Transaction
+from app.routes import transactions
+from app.utils import idempotency
+from tests.factories import add_users, add_group, auth_headers
+
+def setup_deposit(app):
+    user_id = add_users(1)[0]
+    group_id = add_group(user_id)
+    headers = dict(auth_headers(user_id), **{'Idempotency-Key': 'deposit-1'})
+
+    def post():
+        return app.test_client().post('/api/transactions', json={'group_id': group_id, 'amount': '5.00'}, headers=headers)
+
+    return user_id, post
+
+def deposits():
+    return db.session.scalar(db.select(db.func.count()).select_from(Transaction))
+
+def test_retries_replay_the_first_response(app):
+    _, post = setup_deposit(app)
+
+    first, retry = post(), post()
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    assert deposits() == 1
+
+def expire_lease(app, user_id):
+    db.session.execute(
+        db.update(IdempotencyKey).where(IdempotencyKey.user_id == user_id)
+        .values(created_at=datetime.utcnow() - app.config['IDEMPOTENCY_LEASE'] - timedelta(seconds=1))
+    )
+    db.session.commit()
+
+def test_claims_of_committed_requests_are_never_taken_over(app):
+    user_id, post = setup_deposit(app)
+    assert post().status_code == 201
+
+    # As if the request had died after committing, before storing its response
+    db.session.execute(db.update(IdempotencyKey).values(status_code=None, body=None))
+    db.session.commit()
+    assert post().status_code == 409
+
+    expire_lease(app, user_id)
+    response = post()
+    assert response.status_code == 409
+    assert 'response was lost' in response.get_json()['message']
+    assert deposits() == 1
+
+def test_claims_of_requests_that_never_committed_free_up_after_their_lease(app, monkeypatch):
+    user_id, post = setup_deposit(app)
+
+    # As if the worker had been killed before the deposit committed
+    def crash(*args, **kwargs):
+        raise RuntimeError('worker killed')
+    monkeypatch.setattr(transactions, 'create_contribution', crash)
+    monkeypatch.setattr(idempotency, '_release', lambda *args: None)
+    with pytest.raises(RuntimeError):
+        post()
+    monkeypatch.undo()
+
+    assert post().status_code == 409
+    expire_lease(app, user_id)
+    assert post().status_code == 201
+    assert deposits() == 1
+
+def test_a_request_whose_claim_was_taken_over_cannot_commit(app, monkeypatch):
+    user_id, post = setup_deposit(app)
+    create_contribution = transactions.create_contribution
+
+    # As if the lease ran out mid-request and a retry took the key over
+    def taken_over(*args, **kwargs):
+        with db.engine.begin() as connection:
+            connection.execute(db.delete(IdempotencyKey))
+        return create_contribution(*args, **kwargs)
+    monkeypatch.setattr(transactions, 'create_contribution', taken_over)
+
+    assert post().status_code == 409
+    assert deposits() == 0
+    assert db.session.scalar(db.select(db.func.count()).select_from(LedgerEntry)) == 0
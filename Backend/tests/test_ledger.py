@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models import BalanceSnapshot, Group, LedgerEntry, MemberSummary, Membership, Transaction
+from app.services.ledger_service import get_group_balance, take_snapshots, verify_ledger
+from app.services.transaction_service import create_contribution, request_withdrawal
+from tests.factories import add_users, add_group, auth_headers
+
+def add_entries(group_id, entries):
+    """
+    Insert (amount, created_at) ledger entries in order and sync the group's balance
+    """
+    db.session.execute(db.insert(LedgerEntry), [
+        {'group_id': group_id, 'amount': amount, 'created_at': created_at} for amount, created_at in entries
+    ])
+    db.session.execute(
+        db.update(Group).where(Group.id == group_id)
+        .values(current_amount=Group.current_amount + sum(amount for amount, _ in entries))
+    )
+    db.session.commit()
+
+def test_snapshot_covers_entries_with_a_lower_id_but_a_later_time(app):
+    user_id = add_users(1)[0]
+    group_id = add_group(user_id)
+    now = datetime.utcnow()
+    # The first entry got its id first but a later timestamp than the second
+    add_entries(group_id, [(Decimal('5.00'), now - timedelta(minutes=1)), (Decimal('7.00'), now - timedelta(hours=1))])
+
+    assert take_snapshots(min_entries=1) == 1
+    assert verify_ledger() == []
+
+    add_entries(group_id, [(Decimal('3.00'), now)])
+    assert verify_ledger() == []
+
+def test_historical_balance_tail_stops_at_the_next_snapshot(app, statements):
+    user_id = add_users(1)[0]
+    group_id = add_group(user_id)
+    start = datetime.utcnow() - timedelta(days=3)
+    times = [start + timedelta(hours=i) for i in range(40)]
+
+    # A snapshot after every ten entries
+    for chunk in range(4):
+        add_entries(group_id, [(Decimal(i + 1), times[i]) for i in range(chunk * 10, chunk * 10 + 10)])
+        take_snapshots(min_entries=1)
+
+    for i in (0, 4, 15, 25, 39):
+        statements.clear()
+        result = get_group_balance(group_id, user_id, times[i].isoformat())
+
+        assert result['balance'] == sum(range(1, i + 2))
+        tail_sum = [statement for statement in statements if 'sum(ledger_entries.amount)' in statement]
+        assert tail_sum and (i == 39 or 'ledger_entries.id <=' in tail_sum[0])
+
+def test_deleting_a_group_leaves_its_children_to_the_database(app, statements):
+    admin_id, member_id = add_users(2)
+    group_id = add_group(admin_id, [member_id])
+    create_contribution(member_id, group_id, '50.00')
+    request_withdrawal(member_id, group_id, '20.00')
+    take_snapshots()
+    db.session.remove()
+    statements.clear()
+
+    response = app.test_client().delete(f'/api/groups/{group_id}', headers=auth_headers(admin_id))
+
+    assert response.status_code == 200
+    # No collection was loaded just to be deleted row by row
+    assert not [s for s in statements if s.startswith('SELECT') and 'FROM transactions' in s]
+    for model in (Membership, Transaction, MemberSummary, LedgerEntry, BalanceSnapshot):
+        assert db.session.scalar(db.select(db.func.count()).select_from(model)) == 0, model
+
+def test_deleting_a_transaction_keeps_its_ledger_entry(app):
+    user_ids = add_users(1)
+    group_id = add_group(user_ids[0])
+    transaction_id = create_contribution(user_ids[0], group_id, '5.00').id
+
+    db.session.execute(db.delete(Transaction).where(Transaction.id == transaction_id))
+    db.session.commit()
+
+    entry = db.session.scalars(db.select(LedgerEntry)).one()
+    assert entry.transaction_id is None and entry.amount == Decimal('5.00')
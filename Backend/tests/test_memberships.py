@@ -0,0 +1,50 @@
+import pytest
+from app.extensions import db
+from app.models import Transaction
+from app.utils.validators import parse_id
+from tests.factories import add_users, add_group, auth_headers
+
+@pytest.mark.parametrize('group_id', ['x', '', None, [1], {'id': 1}, True, 1.5])
+@pytest.mark.parametrize('path', ['/api/transactions', '/api/withdrawals'])
+def test_non_integer_group_ids_are_not_memberships(app, path, group_id):
+    user_ids = add_users(1)
+    add_group(user_ids[0])
+
+    response = app.test_client().post(path, json={'group_id': group_id, 'amount': '5.00'}, headers=auth_headers(user_ids[0]))
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'You are not a member of this group'
+
+def test_batch_contributions_are_made_by_the_caller_only(app):
+    admin_id, member_id, outsider_id = add_users(3)
+    group_id = add_group(admin_id, [member_id])
+    other_group_id = add_group(outsider_id, name='Other')
+
+    response = app.test_client().post('/api/transactions/batch', json=[
+        {'group_id': group_id, 'amount': '5.00', 'user_id': member_id},
+        {'group_id': other_group_id, 'amount': '5.00'},
+    ], headers=auth_headers(admin_id))
+    results = response.get_json()['data']['results']
+
+    assert [result['status'] for result in results] == ['created', 'error']
+    assert results[1]['message'] == 'You are not a member of this group'
+    assert db.session.get(Transaction, results[0]['transaction_id']).user_id == admin_id
+
+@pytest.mark.parametrize('value', [True, False, 1.5, float('inf'), '1.5', 'x', None])
+def test_parse_id_rejects_what_int_would_coerce_or_refuse(value):
+    with pytest.raises(ValueError, match='Invalid id'):
+        parse_id(value)
+
+def test_batch_items_with_coercible_group_ids_are_refused(app):
+    user_ids = add_users(1)
+    group_id = add_group(user_ids[0])
+
+    response = app.test_client().post('/api/transactions/batch', json=[
+        {'group_id': True, 'amount': '5.00'},
+        {'group_id': group_id + 0.5, 'amount': '5.00'},
+        {'group_id': group_id, 'amount': '5.00'},
+    ], headers=auth_headers(user_ids[0]))
+    results = response.get_json()['data']['results']
+
+    assert [result['status'] for result in results] == ['error', 'error', 'created']
+    assert results[0]['message'] == results[1]['message'] == 'Invalid group id'
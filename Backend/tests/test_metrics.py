@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+from app.extensions import db
+
+def test_metrics_need_the_ops_token(app):
+    client = app.test_client()
+
+    app.config['OPS_TOKEN'] = ''
+    assert client.get('/api/metrics').status_code == 404
+
+    app.config['OPS_TOKEN'] = 'secret'
+    assert client.get('/api/metrics').status_code == 403
+    assert client.get('/api/metrics', headers={'X-Ops-Token': 'wrong'}).status_code == 403
+
+    for headers in ({'X-Ops-Token': 'secret'}, {'Authorization': 'Bearer secret'}):
+        response = client.get('/api/metrics', headers=headers)
+        assert response.status_code == 200
+        assert 'http_requests_total' in response.get_data(as_text=True)
+
+def test_failed_statements_do_not_leave_timings_behind(app):
+    with db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(DBAPIError):
+                connection.exec_driver_sql('SELECT * FROM no_such_table')
+            connection.rollback()
+
+        connection.exec_driver_sql('SELECT 1')
+        assert connection.info['query_started'] == []
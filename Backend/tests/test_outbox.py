@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models import AuditEntry, OutboxEvent
+from app.services import event_handlers
+from app.services.outbox_service import enqueue, process_batch
+from app.services.transaction_service import create_contribution, request_withdrawal, update_withdrawal_status
+from tests.factories import add_users, add_group
+
+def audit(event, action):
+    db.session.add(AuditEntry(event_id=event.id, action=action, group_id=event.payload['group_id']))
+    db.session.flush()
+
+def succeed(event):
+    audit(event, 'test.succeeded')
+
+def fail(event):
+    # Written before failing, so it must be rolled back with the savepoint
+    audit(event, 'test.failed')
+    raise RuntimeError('handler broke')
+
+@pytest.fixture
+def handlers(monkeypatch):
+    monkeypatch.setitem(event_handlers.HANDLERS, 'test.succeed', succeed)
+    monkeypatch.setitem(event_handlers.HANDLERS, 'test.fail', fail)
+
+def make_due(event_id):
+    db.session.execute(db.update(OutboxEvent).where(OutboxEvent.id == event_id).values(available_at=datetime.utcnow()))
+    db.session.commit()
+
+def events():
+    db.session.expire_all()
+    return {event.topic: event for event in db.session.scalars(db.select(OutboxEvent))}
+
+def test_a_failing_handler_rolls_back_alone_and_backs_off(app, handlers):
+    enqueue('test.fail', {'group_id': 1})
+    enqueue('test.succeed', {'group_id': 1})
+    db.session.commit()
+
+    before = datetime.utcnow()
+    assert process_batch() == 2
+
+    failed, succeeded = events()['test.fail'], events()['test.succeed']
+    assert succeeded.processed_at is not None
+    assert failed.processed_at is None and failed.failed_at is None
+    assert failed.attempts == 1 and 'handler broke' in failed.last_error
+    assert failed.available_at >= before + timedelta(seconds=2)
+    assert db.session.scalars(db.select(AuditEntry.action)).all() == ['test.succeeded']
+
+    # Not due again until its backoff has passed
+    assert process_batch() == 0
+
+    make_due(failed.id)
+    before = datetime.utcnow()
+    assert process_batch() == 1
+    failed = events()['test.fail']
+    assert failed.attempts == 2 and failed.available_at >= before + timedelta(seconds=4)
+
+def test_an_event_fails_for_good_after_max_attempts(app, handlers):
+    app.config['OUTBOX_MAX_ATTEMPTS'] = 3
+    enqueue('test.fail', {'group_id': 1})
+    db.session.commit()
+    event_id = events()['test.fail'].id
+
+    for _ in range(3):
+        make_due(event_id)
+        assert process_batch() == 1
+
+    failed = events()['test.fail']
+    assert failed.attempts == 3 and failed.failed_at is not None and failed.processed_at is None
+
+    make_due(event_id)
+    assert process_batch() == 0
+
+def test_redelivered_decisions_are_audited_once(app):
+    admin_id, member_id = add_users(2)
+    group_id = add_group(admin_id, [member_id])
+    create_contribution(admin_id, group_id, '50.00')
+    withdrawal_id = request_withdrawal(member_id, group_id, '20.00').id
+    update_withdrawal_status(withdrawal_id, admin_id, 'approved')
+
+    assert process_batch() == 1
+    # As if the worker died after the handler's writes but before its own bookkeeping landed
+    db.session.execute(db.update(OutboxEvent).values(processed_at=None))
+    db.session.commit()
+    assert process_batch() == 1
+
+    entries = db.session.scalars(db.select(AuditEntry)).all()
+    assert [(entry.action, entry.transaction_id) for entry in entries] == [('withdrawal.approved', withdrawal_id)]
+    assert events()['withdrawal.decided'].processed_at is not None
@@ -0,0 +1,71 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models import Transaction
+from app.utils.pagination import MAX_PAGE_SIZE, parse_limit
+from tests.factories import add_users, add_group, add_transactions, auth_headers
+
+@pytest.fixture
+def history(app):
+    """
+    A group with 23 transactions in runs of five sharing a created_at, next
+    to another group's transactions; returns the member's headers, the
+    group's id and its transaction ids newest first
+    """
+    user_ids = add_users(2)
+    group_id = add_group(user_ids[0])
+    other_group_id = add_group(user_ids[1])
+    add_transactions(other_group_id, [user_ids[1]], 7)
+
+    start = datetime.utcnow() - timedelta(hours=1)
+    db.session.execute(db.insert(Transaction), [
+        {'user_id': user_ids[0], 'group_id': group_id, 'amount': 1, 'type': 'deposit',
+         'status': 'approved', 'created_at': start + timedelta(minutes=i // 5)}
+        for i in range(23)
+    ])
+    db.session.commit()
+
+    ids = db.session.scalars(
+        db.select(Transaction.id).where(Transaction.group_id == group_id)
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+    ).all()
+    return auth_headers(user_ids[0]), group_id, ids
+
+def test_pages_follow_each_other_without_duplicates_or_gaps(app, history):
+    headers, group_id, ids = history
+    client = app.test_client()
+
+    seen, cursor = [], None
+    while True:
+        query = {'limit': 4, **({'cursor': cursor} if cursor else {})}
+        data = client.get(f'/api/groups/{group_id}/transactions', query_string=query, headers=headers).get_json()['data']
+        assert len(data['transactions']) <= 4
+        seen += [transaction['id'] for transaction in data['transactions']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == ids
+
+def test_ndjson_streams_every_row_of_the_group(app, history):
+    headers, group_id, ids = history
+
+    response = app.test_client().get(f'/api/groups/{group_id}/transactions', query_string={'format': 'ndjson'}, headers=headers)
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['id'] for line in lines] == ids
+
+@pytest.mark.parametrize('query', [{'cursor': 'not-a-cursor'}, {'cursor': 'WzEsMl0'}, {'limit': 'abc'}, {'limit': 0}])
+def test_malformed_cursor_or_limit_is_a_bad_request(app, history, query):
+    headers, group_id, _ = history
+
+    response = app.test_client().get(f'/api/groups/{group_id}/transactions', query_string=query, headers=headers)
+
+    assert response.status_code == 400
+
+def test_limit_is_clamped():
+    assert parse_limit(None) == parse_limit('') == 50
+    assert parse_limit('10') == 10
+    assert parse_limit(str(MAX_PAGE_SIZE * 10)) == MAX_PAGE_SIZE
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.services.membership_service import get_role
+from app.services.transaction_service import get_pending_withdrawals, get_transactions_by_group
+from tests.factories import add_users, add_group, add_transactions
+
+# Name each dialect gives the memberships (user_id, group_id) unique constraint's index
+MEMBERSHIP_UNIQUE_INDEX = {
+    'sqlite': 'sqlite_autoindex_memberships_1',
+    'postgresql': 'memberships_user_id_group_id_key',
+}
+
+@pytest.fixture
+def dataset(app):
+    """
+    Ten groups of twenty members with 200 deposits and 20 pending
+    withdrawals each; returns the first group's admin and id
+    """
+    user_ids = add_users(200)
+    groups = []
+    for i in range(10):
+        members = user_ids[i * 20:(i + 1) * 20]
+        group_id = add_group(members[0], members[1:], name=f'Group {i}')
+        add_transactions(group_id, members, 200)
+        add_transactions(group_id, members, 20, type='withdrawal', status='pending')
+        groups.append((members[0], group_id))
+
+    # Give the planner row counts, as a production database would have;
+    # without them SQLite picks between equally costed indexes by schema order
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    db.session.remove()
+    return groups[0]
+
+def explain(fn):
+    """
+    Run fn and return the plan of every statement it ran, as one string each
+    """
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        # Tiny test tables are cheaper to scan; ask whether an index can be used at all
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    plans = []
+    for statement, parameters in captured:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+        plans.append((statement, '\n'.join(str(row[-1]) for row in rows)))
+    db.session.rollback()
+    return plans
+
+def plan_for(plans, table):
+    matching = [plan for statement, plan in plans if f'FROM {table}' in statement]
+    assert matching, f'no statement on {table} was run'
+    return '\n'.join(matching)
+
+def assert_no_scan_of_transactions(plans):
+    for statement, plan in plans:
+        assert 'SCAN transactions' not in plan, statement
+        assert 'Seq Scan on transactions' not in plan, statement
+
+def test_history_page_uses_group_created_at_index(dataset):
+    admin_id, group_id = dataset
+    plans = explain(lambda: get_transactions_by_group(group_id, admin_id, limit=20))
+
+    assert 'ix_transactions_group_id_created_at' in plan_for(plans, 'transactions')
+    assert_no_scan_of_transactions(plans)
+
+def test_pending_withdrawals_use_partial_index(dataset):
+    admin_id, _ = dataset
+    plans = explain(lambda: get_pending_withdrawals(admin_id, limit=20))
+
+    assert 'ix_transactions_pending_withdrawals' in plan_for(plans, 'transactions')
+    assert_no_scan_of_transactions(plans)
+
+def test_membership_lookup_uses_unique_index(dataset):
+    admin_id, group_id = dataset
+    plans = explain(lambda: get_role(admin_id, group_id))
+
+    index = MEMBERSHIP_UNIQUE_INDEX[db.engine.dialect.name]
+    assert index in plan_for(plans, 'memberships')
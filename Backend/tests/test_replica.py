@@ -0,0 +1,83 @@
+import shutil
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.utils.replica import REPLICA
+from tests.factories import add_users, add_group, add_transactions, auth_headers
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        'DATABASE_REPLICA_URI': f"sqlite:///{tmp_path / 'replica.db'}",
+        'REPLICA_STICKY_SECONDS': 60,
+        'RESPONSE_CACHE_BACKEND': 'local',
+    }
+
+@pytest.fixture
+def hits(app):
+    """
+    Statements run on each engine while the test runs, by bind
+    """
+    if db.engine.dialect.name != 'sqlite':
+        pytest.skip('the replica is a copy of the SQLite primary')
+
+    seen = {'primary': 0, REPLICA: 0}
+
+    def counter(name):
+        def count(conn, cursor, statement, parameters, context, executemany):
+            seen[name] += 1
+        return count
+
+    listeners = [(db.engine, counter('primary')), (db.engines[REPLICA], counter(REPLICA))]
+    for engine, listener in listeners:
+        event.listen(engine, 'before_cursor_execute', listener)
+    yield seen
+    for engine, listener in listeners:
+        event.remove(engine, 'before_cursor_execute', listener)
+
+@pytest.fixture
+def lagging(app, tmp_path):
+    """
+    A group with three deposits on the replica and a fourth only on the
+    primary; returns the admin, a member and the group's id
+    """
+    admin_id, member_id = add_users(2)
+    group_id = add_group(admin_id, [member_id])
+    add_transactions(group_id, [admin_id], 3)
+    db.session.remove()
+    db.engine.dispose()
+    shutil.copy(tmp_path / 'test.db', tmp_path / 'replica.db')
+
+    add_transactions(group_id, [admin_id], 1)
+    return admin_id, member_id, group_id
+
+def history(app, user_id, group_id):
+    response = app.test_client().get(f'/api/groups/{group_id}/transactions', headers=auth_headers(user_id))
+    assert response.status_code == 200
+    return response.get_json()['data']['transactions']
+
+def cached(app, user_id, group_id):
+    return app.extensions['response_cache'].get(f'response:{user_id}:/api/groups/{group_id}/transactions?') is not None
+
+def test_reads_go_to_the_replica_and_are_not_cached(app, lagging, hits):
+    admin_id, _, group_id = lagging
+
+    assert len(history(app, admin_id, group_id)) == 3
+    assert hits[REPLICA] > 0 and hits['primary'] == 0
+    assert not cached(app, admin_id, group_id)
+
+def test_reads_right_after_a_write_stick_to_the_primary(app, lagging, hits):
+    admin_id, member_id, group_id = lagging
+
+    response = app.test_client().post('/api/transactions', json={'group_id': group_id, 'amount': '5.00'}, headers=auth_headers(admin_id))
+    assert response.status_code == 201
+    hits.update({'primary': 0, REPLICA: 0})
+
+    assert len(history(app, admin_id, group_id)) == 5
+    assert hits[REPLICA] == 0 and hits['primary'] > 0
+    assert cached(app, admin_id, group_id)
+
+    # Only the writer sticks; other members still read from the replica
+    hits.update({'primary': 0, REPLICA: 0})
+    assert len(history(app, member_id, group_id)) == 3
+    assert hits[REPLICA] > 0 and hits['primary'] == 0
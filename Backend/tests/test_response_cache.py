@@ -0,0 +1,87 @@
+import pytest
+from app.services.transaction_service import create_contribution, request_withdrawal
+from tests.factories import add_users, add_group, auth_headers
+
+@pytest.fixture
+def config():
+    return {'RESPONSE_CACHE_BACKEND': 'local'}
+
+@pytest.fixture
+def group(app):
+    """
+    A group with a deposit and a pending withdrawal, plus a user outside
+    it; returns the admin, member and outsider ids, the group's id and the
+    withdrawal's id
+    """
+    admin_id, member_id, outsider_id = add_users(3)
+    group_id = add_group(admin_id, [member_id])
+    create_contribution(admin_id, group_id, '100.00')
+    withdrawal_id = request_withdrawal(member_id, group_id, '10.00').id
+    return admin_id, member_id, outsider_id, group_id, withdrawal_id
+
+def fetch(app, statements, user_id, url, **kwargs):
+    """
+    GET url as the user; returns the response and whether it was served
+    without touching the database
+    """
+    statements.clear()
+    response = app.test_client().get(url, **{'headers': auth_headers(user_id), **kwargs})
+    # Drain streamed bodies before looking at what ran
+    response.get_data()
+    return response, not statements
+
+def test_repeat_reads_are_served_from_the_cache_and_revalidated(app, statements, group):
+    admin_id, _, _, group_id, _ = group
+    url = f'/api/groups/{group_id}/transactions'
+
+    first, cached = fetch(app, statements, admin_id, url)
+    assert first.status_code == 200 and first.get_etag()[0] and not cached
+
+    second, cached = fetch(app, statements, admin_id, url)
+    assert second.status_code == 200 and cached
+    assert second.get_data() == first.get_data()
+
+    unchanged, cached = fetch(app, statements, admin_id, url, headers={
+        **auth_headers(admin_id), 'If-None-Match': first.headers['ETag']
+    })
+    assert unchanged.status_code == 304 and cached
+
+@pytest.mark.parametrize('change', ['contribution', 'withdrawal decision', 'join', 'leave'])
+def test_changes_to_the_group_invalidate_its_cached_reads(app, statements, group, change):
+    admin_id, member_id, outsider_id, group_id, withdrawal_id = group
+    url = f'/api/groups/{group_id}/transactions'
+    client = app.test_client()
+    fetch(app, statements, admin_id, url)
+
+    response = {
+        'contribution': lambda: client.post('/api/transactions', json={'group_id': group_id, 'amount': '5.00'}, headers=auth_headers(member_id)),
+        'withdrawal decision': lambda: client.put(f'/api/withdrawals/{withdrawal_id}', json={'status': 'approved'}, headers=auth_headers(admin_id)),
+        'join': lambda: client.post(f'/api/groups/{group_id}/join', headers=auth_headers(outsider_id)),
+        'leave': lambda: client.post(f'/api/groups/{group_id}/leave', headers=auth_headers(member_id)),
+    }[change]()
+    assert response.status_code < 400
+
+    _, cached = fetch(app, statements, admin_id, url)
+    assert not cached
+
+def test_joining_invalidates_the_users_cached_group_list(app, statements, group):
+    _, _, outsider_id, group_id, _ = group
+    before, _ = fetch(app, statements, outsider_id, '/api/groups')
+
+    app.test_client().post(f'/api/groups/{group_id}/join', headers=auth_headers(outsider_id))
+
+    after, cached = fetch(app, statements, outsider_id, '/api/groups')
+    assert not cached and after.get_data() != before.get_data()
+
+@pytest.mark.parametrize('query, status', [('format=ndjson', 200), ('cursor=not-a-cursor', 400)])
+def test_streamed_and_failed_responses_are_not_cached(app, statements, group, query, status):
+    admin_id, _, _, group_id, _ = group
+    url = f'/api/groups/{group_id}/transactions?{query}'
+
+    response, _ = fetch(app, statements, admin_id, url)
+
+    assert response.status_code == status
+    assert app.extensions['response_cache'].get(f'response:{admin_id}:{url}') is None
+    # A cacheable read of the same group is stored under the same scheme
+    fetch(app, statements, admin_id, f'/api/groups/{group_id}/transactions?limit=5')
+    assert app.extensions['response_cache'].get(f'response:{admin_id}:/api/groups/{group_id}/transactions?limit=5')
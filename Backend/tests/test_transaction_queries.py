@@ -0,0 +1,43 @@
+from app.extensions import db
+from app.models import Transaction
+from app.services.transaction_service import get_transactions_by_group, _load_transaction
+from tests.factories import add_users, add_group, add_transactions
+
+def seed_group(rows, prefix):
+    """
+    A group with rows transactions, each by a different member
+
+    Returns the admin's id, the group's id and its newest transaction's id
+    """
+    user_ids = add_users(rows, prefix)
+    group_id = add_group(user_ids[0], user_ids[1:])
+    add_transactions(group_id, user_ids, rows)
+    last_id = db.session.scalar(db.select(db.func.max(Transaction.id)).where(Transaction.group_id == group_id))
+    return user_ids[0], group_id, last_id
+
+def count_statements(statements, fn):
+    # Start from an empty identity map so nothing is served without a query
+    db.session.remove()
+    statements.clear()
+    fn()
+    return len(statements)
+
+def test_statement_counts_do_not_grow_with_rows(app, statements):
+    small = seed_group(5, 'small')
+    large = seed_group(500, 'large')
+
+    def history_page(user_id, group_id, last_id):
+        def run():
+            page, _ = get_transactions_by_group(group_id, user_id, limit=500)
+            assert all(item['username'] for item in page)
+        return run
+
+    def single_load(user_id, group_id, last_id):
+        def run():
+            assert _load_transaction(last_id).to_dict()['username']
+        return run
+
+    assert count_statements(statements, history_page(*small)) == count_statements(statements, history_page(*large))
+    # The owner's username comes with the transaction, not from a lazy load
+    single = count_statements(statements, single_load(*small))
+    assert single == count_statements(statements, single_load(*large)) == 1
@@ -0,0 +1,75 @@
+from decimal import Decimal
+import pytest
+from app.extensions import db
+from app.models import Group, Transaction
+from app.services.transaction_service import create_contribution, request_withdrawal, update_withdrawal_status
+from tests.factories import add_users, add_group, auth_headers
+
+@pytest.fixture
+def groups(app):
+    """
+    Two groups holding 100.00 each, with three pending withdrawals of 40.00
+    in the first and one in the second; returns the first group's admin,
+    a plain member, the first group's id and the withdrawal ids
+    """
+    admin_id, member_id, other_admin_id = add_users(3)
+    group_id = add_group(admin_id, [member_id])
+    other_group_id = add_group(other_admin_id, [admin_id], name='Other')
+
+    create_contribution(admin_id, group_id, '100.00')
+    create_contribution(other_admin_id, other_group_id, '100.00')
+    withdrawal_ids = [request_withdrawal(member_id, group_id, '40.00').id for _ in range(3)]
+    other_withdrawal_id = request_withdrawal(admin_id, other_group_id, '40.00').id
+    db.session.remove()
+    return admin_id, member_id, group_id, withdrawal_ids, other_withdrawal_id
+
+def decide(app, user_id, decisions):
+    response = app.test_client().post('/api/withdrawals/decisions', json=decisions, headers=auth_headers(user_id))
+    assert response.status_code == 200
+    return response.get_json()['data']['results']
+
+def statuses(ids):
+    db.session.expire_all()
+    return [db.session.get(Transaction, transaction_id).status for transaction_id in ids]
+
+def test_approvals_beyond_the_balance_are_refused_in_request_order(app, groups):
+    admin_id, _, group_id, withdrawal_ids, _ = groups
+
+    results = decide(app, admin_id, [{'id': transaction_id, 'status': 'approved'} for transaction_id in withdrawal_ids])
+
+    assert [result['status'] for result in results] == ['approved', 'approved', 'error']
+    assert results[2]['message'] == "The group doesn't have enough funds for this withdrawal"
+    assert statuses(withdrawal_ids) == ['approved', 'approved', 'pending']
+    assert db.session.get(Group, group_id).current_amount == Decimal('20.00')
+
+def test_only_admins_of_the_withdrawals_group_may_decide(app, groups):
+    admin_id, member_id, _, withdrawal_ids, other_withdrawal_id = groups
+    denied = "Withdrawal not found or you don't have permission to decide it"
+
+    results = decide(app, member_id, [{'id': withdrawal_ids[0], 'status': 'approved'}])
+    assert [result['message'] for result in results] == [denied]
+
+    # A member, but not an admin, of the other group
+    results = decide(app, admin_id, [
+        {'id': other_withdrawal_id, 'status': 'approved'},
+        {'id': withdrawal_ids[0], 'status': 'rejected'},
+    ])
+    assert [result['status'] for result in results] == ['error', 'rejected']
+    assert results[0]['message'] == denied
+    assert statuses([other_withdrawal_id, withdrawal_ids[0]]) == ['pending', 'rejected']
+
+def test_already_decided_withdrawals_fail_without_blocking_pending_ones(app, groups):
+    admin_id, _, group_id, withdrawal_ids, _ = groups
+    update_withdrawal_status(withdrawal_ids[0], admin_id, 'approved')
+    update_withdrawal_status(withdrawal_ids[1], admin_id, 'rejected')
+
+    results = decide(app, admin_id, [
+        {'id': withdrawal_ids[0], 'status': 'approved'},
+        {'id': withdrawal_ids[1], 'status': 'approved'},
+        {'id': withdrawal_ids[2], 'status': 'approved'},
+    ])
+
+    assert [result['status'] for result in results] == ['error', 'error', 'approved']
+    assert {results[0]['message'], results[1]['message']} == {"This withdrawal has already been processed"}
+    assert statuses(withdrawal_ids) == ['approved', 'rejected', 'approved']
+    assert db.session.get(Group, group_id).current_amount == Decimal('20.00')